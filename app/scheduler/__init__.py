@@ -2,7 +2,12 @@
 
 from .models import Assignment, Beruf, Schedule, Shift, ShiftType, Staff
 from .solver import SolverResult, generate_schedule
-from .validator import ValidationResult, validate_schedule
+from .validator import (
+    ValidationResult,
+    validate_schedule,
+    validate_schedule_cached,
+    validate_swap,
+)
 
 __all__ = [
     "Assignment",
@@ -15,4 +20,6 @@ __all__ = [
     "generate_schedule",
     "ValidationResult",
     "validate_schedule",
+    "validate_schedule_cached",
+    "validate_swap",
 ]
@@ -1,11 +1,13 @@
 """Data models for staff, shifts, and schedules."""
 
 import csv
+import io
 import json
+import sys
 from datetime import date, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -44,6 +46,13 @@ class ShiftType(str, Enum):
     NIGHT_SAT_SUN = "N_Sa-So"
 
 
+# Shift type categories, derived once from the enum value prefixes
+NIGHT_SHIFT_TYPES = frozenset(t for t in ShiftType if t.value.startswith("N_"))
+SATURDAY_SHIFT_TYPES = frozenset(t for t in ShiftType if t.value.startswith("Sa_"))
+SUNDAY_SHIFT_TYPES = frozenset(t for t in ShiftType if t.value.startswith("So_"))
+WEEKEND_SHIFT_TYPES = SATURDAY_SHIFT_TYPES | SUNDAY_SHIFT_TYPES
+
+
 class Staff(BaseModel):
     """Staff member with Notdienst capabilities."""
 
@@ -61,6 +70,12 @@ class Staff(BaseModel):
     nd_exceptions: list[int] = Field(default_factory=list)  # Weekdays (1=Mon, 7=Sun) excluded
     birthday: str | None = None  # Birthday in MM-DD format (no year), e.g. "04-15"
 
+    @field_validator("identifier")
+    @classmethod
+    def intern_identifier(cls, v: str) -> str:
+        """Intern identifiers; they are used as lookup keys throughout validation."""
+        return sys.intern(v)
+
     @field_validator("birthday", mode="before")
     @classmethod
     def parse_birthday(cls, v: Any) -> str | None:
@@ -127,19 +142,21 @@ class Staff(BaseModel):
         return 0.5 if is_paired else 1.0
 
     def can_work_shift(self, shift_type: ShiftType, shift_date: date) -> bool:
-        """Check basic eligibility for a shift type on a given date."""
+        """Check basic eligibility for a shift type on a given date.
+
+        The validator caches results per shift type and weekday, keyed by the
+        staff fields read here (see validator._eligibility_table).
+        """
         # Minors cannot work Sundays
-        if not self.adult and shift_type.value.startswith("So_"):
+        if not self.adult and shift_type in SUNDAY_SHIFT_TYPES:
             return False
 
         # Interns never work weekends
-        if self.beruf == Beruf.INTERN and (
-            shift_type.value.startswith("Sa_") or shift_type.value.startswith("So_")
-        ):
+        if self.beruf == Beruf.INTERN and shift_type in WEEKEND_SHIFT_TYPES:
             return False
 
         # Night shifts
-        if shift_type.value.startswith("N_"):
+        if shift_type in NIGHT_SHIFT_TYPES:
             if not self.nd_possible:
                 return False
             # Check nd_exceptions (weekday restrictions)
@@ -186,11 +203,11 @@ class Shift(BaseModel):
 
     def is_night_shift(self) -> bool:
         """Check if this is a night shift."""
-        return self.shift_type.value.startswith("N_")
+        return self.shift_type in NIGHT_SHIFT_TYPES
 
     def is_weekend_shift(self) -> bool:
         """Check if this is a weekend shift."""
-        return self.shift_type.value.startswith("Sa_") or self.shift_type.value.startswith("So_")
+        return self.shift_type in WEEKEND_SHIFT_TYPES
 
     def get_next_day(self) -> date:
         """Get the date of the next day after this shift."""
@@ -204,6 +221,12 @@ class Assignment(BaseModel):
     staff_identifier: str
     is_paired: bool = False  # True if this night shift is worked with a partner
 
+    @field_validator("staff_identifier")
+    @classmethod
+    def intern_staff_identifier(cls, v: str) -> str:
+        """Intern identifiers so staff lookups compare by identity."""
+        return sys.intern(v)
+
 
 class Schedule(BaseModel):
     """Complete schedule for a quarter."""
@@ -212,6 +235,17 @@ class Schedule(BaseModel):
     quarter_end: date
     assignments: list[Assignment] = Field(default_factory=list)
 
+    def fingerprint(self) -> tuple[Any, ...]:
+        """Hashable summary of the schedule's contents, for caching derived views."""
+        return (
+            self.quarter_start,
+            self.quarter_end,
+            tuple(
+                (a.staff_identifier, a.shift.shift_date, a.shift.shift_type, a.is_paired)
+                for a in self.assignments
+            ),
+        )
+
     def get_staff_assignments(self, staff_identifier: str) -> list[Assignment]:
         """Get all assignments for a specific staff member."""
         return [a for a in self.assignments if a.staff_identifier == staff_identifier]
@@ -256,10 +290,17 @@ class Schedule(BaseModel):
         )
 
 
-def load_staff_from_csv(csv_path: Path) -> list[Staff]:
-    """Load staff data from CSV file."""
+def _open_csv(source: Path | IO[bytes]) -> IO[str]:
+    """Open a CSV file path, or wrap a binary stream (e.g. an upload), as UTF-8 text."""
+    if isinstance(source, Path):
+        return source.open("r", encoding="utf-8")
+    return io.TextIOWrapper(source, encoding="utf-8", newline="")
+
+
+def load_staff_from_csv(source: Path | IO[bytes]) -> list[Staff]:
+    """Load staff data from a CSV file path or a binary stream such as an upload."""
     staff_list: list[Staff] = []
-    with csv_path.open("r", encoding="utf-8") as f:
+    with _open_csv(source) as f:
         reader = csv.DictReader(f)
         for row in reader:
             # Convert string booleans
@@ -347,14 +388,14 @@ class Vacation(BaseModel):
         return (self.end_date - self.start_date).days + 1
 
 
-def load_vacations_from_csv(csv_path: Path) -> list[Vacation]:
-    """Load vacation data from CSV file.
+def load_vacations_from_csv(source: Path | IO[bytes]) -> list[Vacation]:
+    """Load vacation data from a CSV file path or a binary stream such as an upload.
 
     Expected format: identifier,start_date,end_date
     Dates should be in ISO format (YYYY-MM-DD).
     """
     vacations: list[Vacation] = []
-    with csv_path.open("r", encoding="utf-8") as f:
+    with _open_csv(source) as f:
         reader = csv.DictReader(f)
         for row in reader:
             vacations.append(
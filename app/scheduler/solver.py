@@ -16,6 +16,7 @@ def generate_schedule(
     max_solve_time_seconds: int = 120,
     random_seed: int | None = None,
     previous_context: PreviousPlanContext | None = None,
+    num_workers: int | None = None,
 ) -> SolverResult:
     """Generate schedule using OR-Tools CP-SAT solver.
 
@@ -26,6 +27,8 @@ def generate_schedule(
         max_solve_time_seconds: Maximum solver time in seconds (default 120)
         random_seed: Random seed for reproducibility
         previous_context: Carry-forward context from previous quarter
+        num_workers: Number of parallel CP-SAT search workers (default: one
+            per CPU core; 1 restores a single sequential search)
 
     Returns:
         SolverResult with best schedule or unsatisfiable constraints
@@ -40,4 +43,5 @@ def generate_schedule(
         max_solve_time_seconds=max_solve_time_seconds,
         random_seed=random_seed,
         previous_context=previous_context,
+        num_workers=num_workers,
     )
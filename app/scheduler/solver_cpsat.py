@@ -4,12 +4,15 @@ This module provides an alternative solver using constraint programming
 for guaranteed optimal fairness within hard constraint satisfaction.
 """
 
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
 from datetime import date, timedelta
 
 from ortools.sat.python import cp_model
 
 from .models import (
+    NIGHT_SHIFT_TYPES,
     Abteilung,
     Assignment,
     Beruf,
@@ -53,6 +56,7 @@ def generate_schedule_cpsat(
     max_solve_time_seconds: int = 120,
     random_seed: int | None = None,
     previous_context: PreviousPlanContext | None = None,
+    num_workers: int | None = None,
 ) -> SolverResult:
     """Generate schedule using OR-Tools CP-SAT solver.
 
@@ -62,22 +66,208 @@ def generate_schedule_cpsat(
         vacations: List of vacation periods (staff unavailability)
         max_solve_time_seconds: Maximum solver time in seconds
         random_seed: Random seed for reproducibility
+        num_workers: Number of parallel CP-SAT search workers. None uses
+            CP-SAT's default of one worker per CPU core; 1 forces a
+            sequential search.
 
     Returns:
         SolverResult with best schedule or unsatisfiable constraints
     """
     if vacations is None:
         vacations = []
-    
+
+    # Model construction only depends on the inputs below, not on the solver
+    # parameters, so repeated calls (e.g. with another seed) reuse it
+    cache_key = _model_cache_key(staff_list, quarter_start, vacations, previous_context)
+    with _MODEL_CACHE_LOCK:
+        built = _MODEL_CACHE.get(cache_key)
+        if built is not None:
+            _MODEL_CACHE.move_to_end(cache_key)
+    if built is None:
+        # Built outside the lock; concurrent misses on one key just build twice
+        built = _build_model(staff_list, quarter_start, vacations, previous_context)
+        with _MODEL_CACHE_LOCK:
+            _MODEL_CACHE[cache_key] = built
+            if len(_MODEL_CACHE) > _MODEL_CACHE_SIZE:
+                _MODEL_CACHE.popitem(last=False)
+
+    if built.issues or built.model is None:
+        return SolverResult(
+            success=False,
+            schedules=[],
+            penalties=[],
+            unsatisfiable_constraints=list(built.issues),
+        )
+
+    # Work on a copy so the cached model is never modified
+    model = built.model.Clone()
+    x = [
+        None if i is None else model.get_bool_var_from_proto_index(i)
+        for i in built.x_indices
+    ]
+    shifts = built.shifts
+
+    # =========================================================================
+    # SOLVE
+    # =========================================================================
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max_solve_time_seconds
+    if random_seed is not None:
+        solver.parameters.random_seed = random_seed
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+    solver.parameters.log_search_progress = False
+
+    status = solver.Solve(model)
+
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        # Extract solution
+        schedule = _extract_schedule(
+            solver, x, staff_list, shifts, quarter_start, built.quarter_end
+        )
+
+        # Validate (should pass, but good to confirm)
+        validation = validate_schedule(schedule, staff_list)
+        penalty = validation.soft_penalty
+
+        return SolverResult(
+            success=True,
+            schedules=[schedule],
+            penalties=[penalty],
+            unsatisfiable_constraints=[],
+        )
+    else:
+        # Infeasible or timeout
+        unsatisfiable: list[str] = []
+        if status == cp_model.INFEASIBLE:
+            # Name the guarded constraint groups involved in the conflict, within
+            # what is left of the time budget (at least one second)
+            remaining_seconds = max(1.0, max_solve_time_seconds - solver.WallTime())
+            unsatisfiable.extend(
+                _conflicting_assumptions(model, built.assumptions, remaining_seconds)
+            )
+        unsatisfiable.extend(
+            _diagnose_infeasibility(
+                model, staff_list, shifts, built.min_participation_info
+            )
+        )
+        return SolverResult(
+            success=False,
+            schedules=[],
+            penalties=[],
+            unsatisfiable_constraints=unsatisfiable,
+        )
+
+
+def _conflicting_assumptions(
+    model: cp_model.CpModel, assumptions: dict[str, int], time_limit_seconds: float
+) -> list[str]:
+    """Describe the guarded constraint groups in an infeasibility core of model.
+
+    With an objective, CP-SAT reports every assumption literal as sufficient for
+    the conflict, so the core is read from a feasibility-only re-solve on a single
+    worker instead. That re-solve takes up to time_limit_seconds on top of the
+    original solve; no core is reported if it times out. Clears the objective
+    of model.
+    """
+    model.ClearObjective()
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit_seconds
+    solver.parameters.num_workers = 1
+    if solver.Solve(model) != cp_model.INFEASIBLE:
+        return []
+
+    core = set(solver.SufficientAssumptionsForInfeasibility())
+    return [
+        f"Conflicting constraint: {description}"
+        for description, index in assumptions.items()
+        if index in core
+    ]
+
+
+class _BuiltModel:
+    """A constructed CP-SAT model and what is needed to read its solutions.
+
+    Variables are referenced by proto index so the model can be cloned.
+    """
+
+    def __init__(
+        self,
+        model: cp_model.CpModel | None,
+        shifts: list[Shift],
+        quarter_end: date,
+        x_indices: list[int | None],
+        assumptions: dict[str, int],
+        min_participation_info: dict[str, dict[str, bool]] | None,
+        issues: list[str],
+    ) -> None:
+        self.model = model
+        self.shifts = shifts
+        self.quarter_end = quarter_end
+        self.x_indices = x_indices
+        self.assumptions = assumptions
+        self.min_participation_info = min_participation_info
+        self.issues = issues
+
+
+# Recently built models, keyed by _model_cache_key (least recently used first).
+# Streamlit runs each session on its own thread, so access goes through the lock.
+_MODEL_CACHE: OrderedDict[str, _BuiltModel] = OrderedDict()
+_MODEL_CACHE_SIZE = 4
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _model_cache_key(
+    staff_list: list[Staff],
+    quarter_start: date,
+    vacations: list[Vacation],
+    previous_context: PreviousPlanContext | None,
+) -> str:
+    """Serialize every input that affects model construction into one key."""
+    parts = [quarter_start.isoformat()]
+    parts.extend(staff.model_dump_json() for staff in staff_list)
+    parts.append("|")
+    parts.extend(vacation.model_dump_json() for vacation in vacations)
+    parts.append(previous_context.model_dump_json() if previous_context else "")
+    return "\n".join(parts)
+
+
+def _build_model(
+    staff_list: list[Staff],
+    quarter_start: date,
+    vacations: list[Vacation],
+    previous_context: PreviousPlanContext | None,
+) -> _BuiltModel:
+    """Build the CP-SAT model: variables, hard constraints, objective and hints.
+
+    If a hard requirement is found unreachable during construction, the
+    returned model is None and the issues are reported instead.
+    """
     model = cp_model.CpModel()
 
     # Generate all shifts for the quarter
     shifts = generate_quarter_shifts(quarter_start)
-    quarter_end = max(s.shift_date for s in shifts) if shifts else quarter_start
-
-    # Index mappings
-    staff_by_id = {s.identifier: s for s in staff_list}
-    shift_index = {(s.shift_date, s.shift_type): i for i, s in enumerate(shifts)}
+    quarter_end = shifts[-1].shift_date if shifts else quarter_start  # shifts are in date order
+
+    # Separate shifts by category in a single pass, as indices into shifts.
+    # generate_quarter_shifts emits shifts in date order, so the index lists
+    # are date-ordered without sorting.
+    weekend_idx: list[int] = []
+    night_idx: list[int] = []
+    # Shift indices per date, built once and shared with the constraint helpers
+    shift_idx_by_date: dict[date, list[int]] = defaultdict(list)
+    weekend_idx_by_date: dict[date, list[int]] = defaultdict(list)
+    night_idx_by_date: dict[date, list[int]] = defaultdict(list)
+    for i, s in enumerate(shifts):
+        shift_idx_by_date[s.shift_date].append(i)
+        if s.is_weekend_shift():
+            weekend_idx.append(i)
+            weekend_idx_by_date[s.shift_date].append(i)
+        elif s.is_night_shift():
+            night_idx.append(i)
+            night_idx_by_date[s.shift_date].append(i)
+    night_dates = [shifts[i].shift_date for i in night_idx]
 
     # Pre-compute vacation dates per staff for efficient lookup
     staff_vacation_dates: dict[str, set[date]] = {
@@ -103,7 +293,7 @@ def generate_schedule_cpsat(
     if previous_context:
         for ta in previous_context.trailing_assignments:
             trailing_work_dates.setdefault(ta.staff_identifier, set()).add(ta.shift_date)
-            if ta.shift_type.value.startswith("N_"):
+            if ta.shift_type in NIGHT_SHIFT_TYPES:
                 trailing_night_dates.setdefault(ta.staff_identifier, []).append(
                     ta.shift_date
                 )
@@ -115,280 +305,279 @@ def generate_schedule_cpsat(
         for entry in previous_context.carry_forward:
             carry_forward_deltas[entry.identifier] = entry.carry_forward_delta
 
-    # Separate shifts by category
-    weekend_shifts = [s for s in shifts if s.is_weekend_shift()]
-    night_shifts = [s for s in shifts if s.is_night_shift()]
-
-    # Night shifts categorized by Intern presence (Interns are on-site Sun-Mon, Mon-Tue)
-    intern_present_nights = [
-        s for s in night_shifts
-        if s.shift_type in (ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE)
-    ]
-    regular_nights = [
-        s for s in night_shifts
-        if s.shift_type not in (ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE)
-    ]
-
     # =========================================================================
     # DECISION VARIABLES
     # =========================================================================
 
-    # x[s, d, t] = 1 if staff s is assigned to shift (d, t)
-    # Staff on vacation are excluded from consideration for that date
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar] = {}
+    # eligible[s_idx][shift_idx] = staff can work the shift and is not on vacation.
+    # Computed once so eligibility is never re-derived from Staff attributes.
+    eligible: list[list[bool]] = []
     for staff in staff_list:
         vacation_dates = staff_vacation_dates[staff.identifier]
-        for shift in shifts:
-            # Skip if staff is on vacation on this date
-            if shift.shift_date in vacation_dates:
-                continue
-            if staff.can_work_shift(shift.shift_type, shift.shift_date):
-                key = (staff.identifier, shift.shift_date, shift.shift_type)
-                x[key] = model.NewBoolVar(f"x_{staff.identifier}_{shift.shift_date}_{shift.shift_type.value}")
-
-    # is_paired[s, d] = 1 if staff s works night shift on date d paired (2 people)
-    # This is determined by sum of assignments for that night
-    is_paired: dict[tuple[str, date], cp_model.IntVar] = {}
-    for shift in night_shifts:
-        for staff in staff_list:
-            key = (staff.identifier, shift.shift_date, shift.shift_type)
-            if key in x:
-                pair_key = (staff.identifier, shift.shift_date)
-                if pair_key not in is_paired:
-                    is_paired[pair_key] = model.NewBoolVar(
-                        f"paired_{staff.identifier}_{shift.shift_date}"
-                    )
+        eligible.append([
+            shift.shift_date not in vacation_dates
+            and staff.can_work_shift(shift.shift_type, shift.shift_date)
+            for shift in shifts
+        ])
+
+    # Interns with any eligible night get the night cap (recorded before pruning)
+    has_eligible_night = [any(row[i] for i in night_idx) for row in eligible]
+    # Nights with any eligible staff / any eligible non-Azubi, also recorded
+    # before pruning: a pruned slot counts as fixed to 0, so the coverage and
+    # pairing rules below must still be posted for it
+    night_staffed = {i: any(row[i] for row in eligible) for i in night_idx}
+    night_has_non_azubi = {
+        i: any(
+            row[i] for row, s in zip(eligible, staff_list, strict=True) if s.beruf != Beruf.AZUBI
+        )
+        for i in night_idx
+    }
+
+    # Nights that can never be part of a long enough block get no variable
+    _prune_short_night_runs(eligible, staff_list, night_idx, night_dates, trailing_night_dates)
+
+    # x[s_idx * n_shifts + shift_idx] = 1 if staff s is assigned to the shift.
+    # Flat list (None for ineligible pairs): a staff row is the slice
+    # x[s_idx * n_shifts:(s_idx + 1) * n_shifts], a shift column is x[shift_idx::n_shifts].
+    n_shifts = len(shifts)
+    x: list[cp_model.IntVar | None] = [None] * (len(staff_list) * n_shifts)
+    for s_idx, (staff, staff_eligible) in enumerate(zip(staff_list, eligible, strict=True)):
+        base = s_idx * n_shifts
+        for shift_idx, (shift, is_eligible) in enumerate(zip(shifts, staff_eligible, strict=True)):
+            if is_eligible:
+                x[base + shift_idx] = model.NewBoolVar(
+                    f"x_{staff.identifier}_{shift.shift_date}_{shift.shift_type.value}"
+                )
+
+    # day_vars[s_idx][date] = the staff member's assignment variables on that
+    # date (dates in order, only dates with at least one variable). Built once
+    # for the per-day and block constraints.
+    day_vars: list[dict[date, list[cp_model.IntVar]]] = []
+    for s_idx in range(len(staff_list)):
+        row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
+        staff_days: dict[date, list[cp_model.IntVar]] = {}
+        for d, day_idx in shift_idx_by_date.items():
+            vars_on_d = [var for i in day_idx if (var := row[i]) is not None]
+            if vars_on_d:
+                staff_days[d] = vars_on_d
+        day_vars.append(staff_days)
+
+    # Night role per staff index (static across shifts), derived once from
+    # the Staff attributes and reused by the constraints and the objective
+    ROLE_AZUBI, ROLE_ALONE, ROLE_PAIRED = 0, 1, 2
+    night_roles = [
+        ROLE_AZUBI if s.beruf == Beruf.AZUBI else ROLE_ALONE if s.nd_alone else ROLE_PAIRED
+        for s in staff_list
+    ]
+
+    # vet_night_azubis[shift index] = Azubi variables on a vet-present night.
+    # Such a night has exactly one non-Azubi, who is paired exactly when one of
+    # these Azubis is assigned. Regular nights need no pairing information:
+    # nd_alone=True staff always work solo and nd_alone=False staff are always
+    # paired there.
+    vet_night_azubis: dict[int, list[cp_model.IntVar]] = {}
+    for shift_idx in night_idx:
+        if shifts[shift_idx].shift_type in (ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE):
+            vet_night_azubis[shift_idx] = [
+                var
+                for role, var in zip(night_roles, x[shift_idx::n_shifts], strict=True)
+                if var is not None and role == ROLE_AZUBI
+            ]
 
     # =========================================================================
     # HARD CONSTRAINTS
     # =========================================================================
 
     # 0. Max 1 shift per person per day (prevents double-booking on same day)
-    shifts_by_date: dict[date, list[Shift]] = defaultdict(list)
-    for s in shifts:
-        shifts_by_date[s.shift_date].append(s)
-    
-    for staff in staff_list:
-        for d, day_shifts in shifts_by_date.items():
-            vars_for_day = [
-                x[(staff.identifier, s.shift_date, s.shift_type)]
-                for s in day_shifts
-                if (staff.identifier, s.shift_date, s.shift_type) in x
-            ]
+    for staff_days in day_vars:
+        for vars_for_day in staff_days.values():
             if len(vars_for_day) > 1:
-                model.Add(sum(vars_for_day) <= 1)
+                model.AddAtMostOne(vars_for_day)
 
     # 1. Weekend shift coverage: exactly 1 person per shift
-    for shift in weekend_shifts:
-        staff_for_shift = [
-            x[(s.identifier, shift.shift_date, shift.shift_type)]
-            for s in staff_list
-            if (s.identifier, shift.shift_date, shift.shift_type) in x
-        ]
+    for shift_idx in weekend_idx:
+        staff_for_shift = [v for v in x[shift_idx::n_shifts] if v is not None]
         if staff_for_shift:
-            model.Add(sum(staff_for_shift) == 1)
+            model.AddExactlyOne(staff_for_shift)
 
     # 2. Night shift coverage:
     #    - Sun-Mon and Mon-Tue (vet present): exactly 1 non-Azubi + optional 0-1 Azubi
     #    - Other nights: 1-2 people total
     #    - At least one non-Azubi required on all nights
-    for shift in night_shifts:
+    # 3. Azubi and nd_alone constraints:
+    #    - Azubis must always pair with a non-Azubi (TFA or Intern)
+    #    - Two Azubis can NEVER work together on any night
+    #    - nd_alone=False (non-Azubi) must be paired on regular nights
+    #    - nd_alone=True (non-Azubi) must work COMPLETELY ALONE on regular nights
+
+    for shift_idx in night_idx:
+        shift = shifts[shift_idx]
         is_vet_present = shift.shift_type in (ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE)
         
-        # Categorize staff for this shift
-        azubi_vars = [
-            x[(s.identifier, shift.shift_date, shift.shift_type)]
-            for s in staff_list
-            if (s.identifier, shift.shift_date, shift.shift_type) in x
-            and s.beruf == Beruf.AZUBI
-        ]
-        non_azubi_vars = [
-            x[(s.identifier, shift.shift_date, shift.shift_type)]
-            for s in staff_list
-            if (s.identifier, shift.shift_date, shift.shift_type) in x
-            and s.beruf != Beruf.AZUBI
-        ]
+        # Categorize staff for this shift in a single pass
+        azubi_vars: list[cp_model.IntVar] = []  # Azubis
+        non_azubi_nd_alone_true: list[cp_model.IntVar] = []  # Non-Azubis who must work alone
+        non_azubi_nd_alone_false: list[cp_model.IntVar] = []  # Non-Azubis who must be paired
+        buckets = (azubi_vars, non_azubi_nd_alone_true, non_azubi_nd_alone_false)
+        for role, var in zip(night_roles, x[shift_idx::n_shifts], strict=True):
+            if var is not None:
+                buckets[role].append(var)
+
+        non_azubi_vars = non_azubi_nd_alone_true + non_azubi_nd_alone_false
         all_vars = azubi_vars + non_azubi_vars
         
-        if not all_vars:
+        # Empty variable lists below (all slots pruned) make the rule infeasible
+        if not night_staffed[shift_idx]:
             continue
+        has_non_azubi = night_has_non_azubi[shift_idx]
         
         if is_vet_present:
             # Vet-present nights: exactly 1 non-Azubi + optional 0-1 Azubi
-            if non_azubi_vars:
-                model.Add(sum(non_azubi_vars) == 1)  # Exactly 1 non-Azubi
-            if azubi_vars:
-                model.Add(sum(azubi_vars) <= 1)  # Optional: max 1 Azubi
+            if has_non_azubi:
+                model.AddExactlyOne(non_azubi_vars)  # Exactly 1 non-Azubi
         else:
             # Regular nights: 1-2 people total, at least 1 non-Azubi
-            coverage_sum = sum(all_vars)
-            model.Add(coverage_sum >= 1)
-            model.Add(coverage_sum <= 2)
-            if non_azubi_vars:
-                model.Add(sum(non_azubi_vars) >= 1)
-        
-        # Link is_paired variable: paired iff 2 people assigned (only for regular nights)
-        if not is_vet_present:
-            coverage_sum = sum(all_vars)
-            sum_is_two = model.NewBoolVar(f"sum2_{shift.shift_date}_{shift.shift_type.value}")
-            model.Add(coverage_sum == 2).OnlyEnforceIf(sum_is_two)
-            model.Add(coverage_sum != 2).OnlyEnforceIf(sum_is_two.Not())
-            
-            for s in staff_list:
-                key = (s.identifier, shift.shift_date, shift.shift_type)
-                pair_key = (s.identifier, shift.shift_date)
-                if key in x and pair_key in is_paired:
-                    # is_paired = sum_is_two AND assigned
-                    model.AddBoolAnd([sum_is_two, x[key]]).OnlyEnforceIf(is_paired[pair_key])
-                    model.AddBoolOr([sum_is_two.Not(), x[key].Not()]).OnlyEnforceIf(
-                        is_paired[pair_key].Not()
-                    )
+            model.AddLinearConstraint(cp_model.LinearExpr.Sum(all_vars), 1, 2)
+            if has_non_azubi:
+                model.AddBoolOr(non_azubi_vars)
 
-    # 3. Azubi and nd_alone constraints:
-    #    - Azubis must always pair with a non-Azubi (TFA or Intern)
-    #    - Two Azubis can NEVER work together on any night
-    #    - nd_alone=False (non-Azubi) must be paired on regular nights
-    #    - nd_alone=True (non-Azubi) must work COMPLETELY ALONE on regular nights
-    
-    for shift in night_shifts:
-        is_vet_present = shift.shift_type in (ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE)
-        
-        # Categorize staff for this shift
-        azubi_vars = []  # Azubis
-        non_azubi_nd_alone_true = []  # Non-Azubis who must work alone
-        non_azubi_nd_alone_false = []  # Non-Azubis who must be paired
-        
-        for staff in staff_list:
-            key = (staff.identifier, shift.shift_date, shift.shift_type)
-            if key not in x:
-                continue
-            
-            if staff.beruf == Beruf.AZUBI:
-                azubi_vars.append((staff, x[key]))
-            elif staff.nd_alone:
-                non_azubi_nd_alone_true.append((staff, x[key]))
-            else:
-                non_azubi_nd_alone_false.append((staff, x[key]))
-        
         # Rule: At most 1 Azubi per night (two Azubis can never pair)
         if len(azubi_vars) > 1:
-            model.Add(sum(v for _, v in azubi_vars) <= 1)
+            model.AddAtMostOne(azubi_vars)
         
         # Rule: Azubi can only work if a non-Azubi is also assigned
-        for azubi_staff, azubi_var in azubi_vars:
-            non_azubi_vars = [v for _, v in non_azubi_nd_alone_true + non_azubi_nd_alone_false]
-            if non_azubi_vars:
+        if has_non_azubi:
+            for azubi_var in azubi_vars:
                 # If Azubi is assigned, at least one non-Azubi must be assigned
-                model.Add(sum(non_azubi_vars) >= 1).OnlyEnforceIf(azubi_var)
+                model.AddBoolOr(non_azubi_vars).OnlyEnforceIf(azubi_var)
         
         # For regular nights (not vet-present):
         if not is_vet_present:
             # nd_alone=True staff must work COMPLETELY alone (no one else at all)
-            for staff, var in non_azubi_nd_alone_true:
-                all_other_vars = [
-                    v for (s, v) in non_azubi_nd_alone_true + non_azubi_nd_alone_false + azubi_vars
-                    if s.identifier != staff.identifier
-                ]
+            for var in non_azubi_nd_alone_true:
+                all_other_vars = [v for v in all_vars if v is not var]
                 if all_other_vars:
                     # If nd_alone=True staff is assigned, no one else can be
-                    for other_var in all_other_vars:
-                        model.Add(var + other_var <= 1)
-                    # If nd_alone=True staff is assigned, no one else can be
-                    for other_var in all_other_vars:
-                        model.Add(var + other_var <= 1)
+                    model.Add(cp_model.LinearExpr.Sum(all_other_vars) == 0).OnlyEnforceIf(var)
             
-            # nd_alone=False staff must be paired (sum == 2)
-            for staff, var in non_azubi_nd_alone_false:
-                pair_key = (staff.identifier, shift.shift_date)
-                if pair_key in is_paired:
-                    model.AddImplication(var, is_paired[pair_key])
+            # nd_alone=False staff must be paired (sum == 2, upper bound posted above).
+            # One linear cut per shift instead of one reified sum per staff:
+            # 2 * coverage >= 2 + (number of nd_alone=False staff assigned)
+            if non_azubi_nd_alone_false:
+                model.Add(
+                    cp_model.LinearExpr.WeightedSum(
+                        all_vars + non_azubi_nd_alone_false,
+                        [2] * len(all_vars) + [-1] * len(non_azubi_nd_alone_false),
+                    )
+                    >= 2
+                )
+
+    # Assumption literals guarding constraint groups that commonly cause
+    # infeasibility (description -> literal). On INFEASIBLE, CP-SAT reports
+    # which of them are sufficient for the conflict.
+    assumptions: dict[str, cp_model.IntVar] = {}
 
     # 4. Intern night cap: 6-9 nights per quarter (2-3/month)
-    for staff in staff_list:
+    intern_cap_issues: list[str] = []
+    for s_idx, staff in enumerate(staff_list):
         if staff.beruf == Beruf.INTERN:
-            intern_night_vars = [
-                x[(staff.identifier, s.shift_date, s.shift_type)]
-                for s in night_shifts
-                if (staff.identifier, s.shift_date, s.shift_type) in x
-            ]
-            if intern_night_vars:
-                model.Add(sum(intern_night_vars) >= 6)
-                model.Add(sum(intern_night_vars) <= 9)
+            row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
+            intern_night_vars = [row[i] for i in night_idx if row[i] is not None]
+            if not has_eligible_night[s_idx]:
+                continue
+            if len(intern_night_vars) < 6:
+                # Cap can never be met; report it instead of solving an infeasible model
+                intern_cap_issues.append(
+                    f"{staff.name} (Intern) has only {len(intern_night_vars)} available nights "
+                    f"but must work at least 6 per quarter."
+                )
+                continue
+            lit = model.NewBoolVar(f"assume_intern_cap_{staff.identifier}")
+            assumptions[f"Intern night cap (6-9 nights) for {staff.name}"] = lit
+            model.AddLinearConstraint(
+                cp_model.LinearExpr.Sum(intern_night_vars), 6, 9
+            ).OnlyEnforceIf(lit)
+
+    if intern_cap_issues:
+        return _BuiltModel(None, shifts, quarter_end, [], {}, None, intern_cap_issues)
 
     # 5. Weekend isolation: weekend shifts cannot be adjacent to any other shift
     # This ensures weekend shifts are always single-shift blocks
-    _add_weekend_isolation_constraints(model, x, staff_list, weekend_shifts, night_shifts)
+    _add_weekend_isolation_constraints(
+        model, x, n_shifts, staff_list, shifts, weekend_idx, shift_idx_by_date
+    )
 
     # 6. Night/Day conflict: no day shift same day or next day after night shift
-    for staff in staff_list:
-        for night_shift in night_shifts:
-            night_key = (staff.identifier, night_shift.shift_date, night_shift.shift_type)
-            if night_key not in x:
+    #    Same-day conflicts are already covered by constraint 0; the next-day
+    #    conflicts form one clique per staff and date: the nights on d-1 plus
+    #    the weekend shifts on d.
+    for s_idx in range(len(staff_list)):
+        row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
+        # Staff without any night or any weekend variable have no conflicts
+        if not any(row[i] is not None for i in night_idx) or not any(
+            row[i] is not None for i in weekend_idx
+        ):
+            continue
+        for d, we_indices in weekend_idx_by_date.items():
+            we_vars = [row[i] for i in we_indices if row[i] is not None]
+            if not we_vars:
                 continue
-
-            # Same day weekend shift
-            for we_shift in weekend_shifts:
-                if we_shift.shift_date == night_shift.shift_date:
-                    we_key = (staff.identifier, we_shift.shift_date, we_shift.shift_type)
-                    if we_key in x:
-                        model.Add(x[night_key] + x[we_key] <= 1)
-
-            # Next day weekend shift
-            next_day = night_shift.shift_date + timedelta(days=1)
-            for we_shift in weekend_shifts:
-                if we_shift.shift_date == next_day:
-                    we_key = (staff.identifier, we_shift.shift_date, we_shift.shift_type)
-                    if we_key in x:
-                        model.Add(x[night_key] + x[we_key] <= 1)
+            prev_nights = [
+                row[i]
+                for i in night_idx_by_date.get(d - timedelta(days=1), ())
+                if row[i] is not None
+            ]
+            if prev_nights:
+                model.AddAtMostOne(prev_nights + we_vars)
 
     # 6b. Night/Day conflict at quarter boundary:
     #     If someone had a night shift on the last day of the previous quarter,
     #     they cannot have a day shift on the first day of this quarter.
     if trailing_last_night:
-        for staff in staff_list:
+        for s_idx, staff in enumerate(staff_list):
             last_night = trailing_last_night.get(staff.identifier)
             if last_night is None:
                 continue
+            row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
             next_day = last_night + timedelta(days=1)
-            for we_shift in weekend_shifts:
-                if we_shift.shift_date == next_day:
-                    we_key = (staff.identifier, we_shift.shift_date, we_shift.shift_type)
-                    if we_key in x:
-                        model.Add(x[we_key] == 0)
+            for we_i in weekend_idx_by_date.get(next_day, ()):
+                if row[we_i] is not None:
+                    model.Add(row[we_i] == 0)
             # Also block night shift on the same day as the trailing night
-            for ns in night_shifts:
-                if ns.shift_date == last_night:
-                    ns_key = (staff.identifier, ns.shift_date, ns.shift_type)
-                    if ns_key in x:
-                        model.Add(x[ns_key] == 0)
+            for i in night_idx_by_date.get(last_night, ()):
+                if row[i] is not None:
+                    model.Add(row[i] == 0)
 
     # 7. 3-week block constraint: gaps between shift blocks must be >= 21 days
     # Track block starts and enforce gap between consecutive blocks
     _add_block_constraints(
-        model, x, staff_list, shifts, quarter_start, quarter_end,
+        model, day_vars, staff_list, quarter_start, quarter_end,
         trailing_work_dates=trailing_work_dates or None,
     )
 
     # 8. nd_max_consecutive constraint: consecutive night blocks cannot exceed nd_max_consecutive
     _add_nd_max_consecutive_constraints(
-        model, x, staff_list, night_shifts,
+        model, x, n_shifts, staff_list, night_idx, night_dates,
         trailing_night_dates=trailing_night_dates or None,
     )
     
     # 9. Non-Azubi min consecutive nights: TFA/Intern must work at least 2 consecutive nights
     _add_min_consecutive_nights_constraints(
-        model, x, staff_list, night_shifts,
+        model, x, n_shifts, staff_list, night_idx, night_dates,
         trailing_night_dates=trailing_night_dates or None,
     )
     
     # 10. Abteilung constraint: employees in same abteilung (op or station) cannot work 
     # night shifts together or on consecutive days (prevents capacity shortages)
-    _add_abteilung_night_constraints(model, x, staff_list, night_shifts)
+    _add_abteilung_night_constraints(
+        model, x, n_shifts, staff_list, night_idx, night_idx_by_date
+    )
 
     # 11. Minimum shift participation: eligible staff must work at least 1 night and 1 weekend
     # This ensures better type balance and prevents "0 nights, all weekends" scenarios
     min_participation_info = _add_min_participation_constraints(
-        model, x, staff_list, weekend_shifts, night_shifts
+        model, x, n_shifts, staff_list, weekend_idx, night_idx, has_eligible_night,
+        assumptions=assumptions,
     )
 
     # =========================================================================
@@ -424,62 +613,77 @@ def generate_schedule_cpsat(
     weekend_half_counts: dict[str, cp_model.LinearExpr] = {}
     night_half_counts: dict[str, cp_model.LinearExpr] = {}
     
-    for staff in staff_list:
-        terms: list[cp_model.LinearExpr] = []
-        weekend_terms: list[cp_model.LinearExpr] = []
-        night_terms: list[cp_model.LinearExpr] = []
+    for s_idx, staff in enumerate(staff_list):
+        base = s_idx * n_shifts
+        # Parallel variable/coefficient lists, turned into flat weighted sums below
+        weekend_vars: list[cp_model.IntVar] = []
+        weekend_coeffs: list[int] = []
+        night_vars: list[cp_model.IntVar] = []
+        night_coeffs: list[int] = []
         
         # Weekend shifts: each counts as 2 half-units
-        for shift in weekend_shifts:
-            key = (staff.identifier, shift.shift_date, shift.shift_type)
-            if key in x:
+        for shift_idx in weekend_idx:
+            var = x[base + shift_idx]
+            if var is not None:
                 # 2 * x (2 half-units per weekend)
-                terms.append(2 * x[key])
-                weekend_terms.append(2 * x[key])
+                weekend_vars.append(var)
+                weekend_coeffs.append(2)
         
         # Night shifts: count depends on pairing and role
         if staff.nd_possible:
-            for shift in night_shifts:
-                key = (staff.identifier, shift.shift_date, shift.shift_type)
-                pair_key = (staff.identifier, shift.shift_date)
-                if key in x:
-                    if staff.beruf == Beruf.AZUBI:
-                        # Azubis always get full credit (2 half-units = 1.0 effective)
-                        terms.append(2 * x[key])
-                        night_terms.append(2 * x[key])
-                    else:
-                        # Non-Azubis: paired = 1 half-unit (0.5), solo = 2 half-units (1.0)
-                        # Formula: contribution = 2*assigned - paired_and_assigned
-                        # = 2 if solo (assigned=1, paired=0)
-                        # = 1 if paired (assigned=1, paired=1)
-                        # = 0 if not assigned
-                        if pair_key in is_paired:
-                            # Create auxiliary variable for "assigned AND paired"
-                            paired_assigned = model.NewBoolVar(
-                                f"paired_assigned_{staff.identifier}_{shift.shift_date}"
-                            )
-                            # paired_assigned = x[key] AND is_paired[pair_key]
-                            model.AddBoolAnd([x[key], is_paired[pair_key]]).OnlyEnforceIf(paired_assigned)
-                            model.AddBoolOr([x[key].Not(), is_paired[pair_key].Not()]).OnlyEnforceIf(
-                                paired_assigned.Not()
-                            )
-                            # contribution = 2*x - paired_assigned
-                            terms.append(2 * x[key] - paired_assigned)
-                            night_terms.append(2 * x[key] - paired_assigned)
-                        else:
-                            # No pairing info available (shouldn't happen for night-capable staff)
-                            # Fall back to solo counting (2 half-units)
-                            terms.append(2 * x[key])
-                            night_terms.append(2 * x[key])
+            role = night_roles[s_idx]
+            # Credit outside vet-present nights, fixed by the role:
+            # Azubis and nd_alone=True staff always count a full night
+            # (2 half-units), nd_alone=False staff are always paired (1 half-unit)
+            fixed_coeff = 1 if role == ROLE_PAIRED else 2
+            for shift_idx in night_idx:
+                x_idx = base + shift_idx
+                var = x[x_idx]
+                if var is None:
+                    continue
+                night_azubis = vet_night_azubis.get(shift_idx) if role != ROLE_AZUBI else None
+                if night_azubis:
+                    # Vet-present night, non-Azubi: paired = 1 half-unit (0.5),
+                    # solo = 2 half-units (1.0)
+                    # Formula: contribution = 2*assigned - paired_and_assigned
+                    # = 2 if solo (assigned=1, no Azubi)
+                    # = 1 if paired (assigned=1, Azubi assigned)
+                    # = 0 if not assigned
+                    # Create auxiliary variable for "assigned AND Azubi present"
+                    paired_assigned = model.NewBoolVar(
+                        f"paired_assigned_{staff.identifier}_{shifts[shift_idx].shift_date}"
+                    )
+                    # At most one Azubi per night, so the sum is the 0/1 presence;
+                    # paired_assigned = x AND present, as three linear inequalities
+                    azubi_present = cp_model.LinearExpr.Sum(night_azubis)
+                    model.Add(paired_assigned <= var)
+                    model.Add(paired_assigned <= azubi_present)
+                    model.Add(paired_assigned >= var + azubi_present - 1)
+                    # contribution = 2*x - paired_assigned
+                    night_vars.extend((var, paired_assigned))
+                    night_coeffs.extend((2, -1))
+                elif night_azubis is not None:
+                    # Vet-present night without any possible Azubi: always solo
+                    night_vars.append(var)
+                    night_coeffs.append(2)
+                else:
+                    night_vars.append(var)
+                    night_coeffs.append(fixed_coeff)
         
-        if terms:
-            notdienst_half_counts[staff.identifier] = sum(terms)
+        if weekend_vars or night_vars:
+            notdienst_half_counts[staff.identifier] = cp_model.LinearExpr.WeightedSum(
+                weekend_vars + night_vars, weekend_coeffs + night_coeffs
+            )
         else:
             notdienst_half_counts[staff.identifier] = 0
         
         # Store separate counts for type balance
-        weekend_half_counts[staff.identifier] = sum(weekend_terms) if weekend_terms else 0
-        night_half_counts[staff.identifier] = sum(night_terms) if night_terms else 0
+        weekend_half_counts[staff.identifier] = (
+            cp_model.LinearExpr.WeightedSum(weekend_vars, weekend_coeffs) if weekend_vars else 0
+        )
+        night_half_counts[staff.identifier] = (
+            cp_model.LinearExpr.WeightedSum(night_vars, night_coeffs) if night_vars else 0
+        )
 
     # FTE-scaled counts (multiplied by 40/hours AND adjusted for presence)
     # To avoid fractions in CP, we multiply everything by a common factor
@@ -509,6 +713,7 @@ def generate_schedule_cpsat(
                     model, objective_terms, notdienst_half_counts, nd_eligible, 
                     SCALE, presence_factors, f"ND_{group_name}",
                     carry_forward_deltas=carry_forward_deltas or None,
+                    assumptions=assumptions,
                 )
         else:
             # TFA and Azubi: combined weekends + nights
@@ -517,6 +722,7 @@ def generate_schedule_cpsat(
                     model, objective_terms, notdienst_half_counts, group, 
                     SCALE, presence_factors, f"ND_{group_name}",
                     carry_forward_deltas=carry_forward_deltas or None,
+                    assumptions=assumptions,
                 )
 
     # =========================================================================
@@ -538,90 +744,114 @@ def generate_schedule_cpsat(
 
     # Minimize total fairness deviation (primary + secondary objectives)
     if objective_terms:
-        model.Minimize(sum(objective_terms))
-
-    # =========================================================================
-    # SOLVE
-    # =========================================================================
-
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = max_solve_time_seconds
-    if random_seed is not None:
-        solver.parameters.random_seed = random_seed
+        model.Minimize(cp_model.LinearExpr.Sum(objective_terms))
+
+    # Search order: branch on the smallest role group first (its fairness range
+    # is the tightest), trying "not assigned" before "assigned"
+    role_vars: dict[Beruf, list[cp_model.IntVar]] = defaultdict(list)
+    for s_idx, staff in enumerate(staff_list):
+        role_vars[staff.beruf].extend(
+            v for v in x[s_idx * n_shifts:(s_idx + 1) * n_shifts] if v is not None
+        )
+    for group_vars in sorted(role_vars.values(), key=len):
+        model.AddDecisionStrategy(group_vars, cp_model.CHOOSE_FIRST, cp_model.SELECT_MIN_VALUE)
+
+    # Warm start: hint a greedy round-robin assignment (violated hints are repaired)
+    hint = _greedy_initial_assignment(staff_list, shifts, eligible)
+    for var, value in zip(x, hint, strict=True):
+        if var is not None:
+            model.AddHint(var, value)
+
+    model.AddAssumptions(list(assumptions.values()))
+
+    return _BuiltModel(
+        model,
+        shifts,
+        quarter_end,
+        [None if var is None else var.Index() for var in x],
+        {description: lit.Index() for description, lit in assumptions.items()},
+        min_participation_info,
+        [],
+    )
 
-    status = solver.Solve(model)
 
-    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        # Extract solution
-        schedule = _extract_schedule(solver, x, is_paired, shifts, quarter_start, quarter_end)
+def _prune_short_night_runs(
+    eligible: list[list[bool]],
+    staff_list: list[Staff],
+    night_idx: list[int],
+    night_dates: list[date],
+    trailing_night_dates: dict[str, list[date]],
+) -> None:
+    """Mark nights ineligible that can never be part of a long enough block.
+
+    A night inside a run of consecutive eligible nights shorter than
+    nd_min_consecutive would be forced to 0 by the min-consecutive rule, so
+    no variable needs to be created for it. A run starting on the first night
+    of the quarter is kept when the staff member has trailing nights from the
+    previous quarter, since those may extend the block. The coverage, pairing
+    and participation rules still treat the pruned slots as fixed to 0.
+    """
+    for s_idx, staff in enumerate(staff_list):
+        min_consecutive = staff.nd_min_consecutive
+        if not staff.nd_possible or min_consecutive <= 1:
+            continue
 
-        # Validate (should pass, but good to confirm)
-        validation = validate_schedule(schedule, staff_list)
-        penalty = validation.soft_penalty
+        staff_eligible = eligible[s_idx]
+        positions = [k for k, i in enumerate(night_idx) if staff_eligible[i]]
+        dates = [night_dates[k] for k in positions]
+        has_trailing = bool(trailing_night_dates.get(staff.identifier))
 
-        return SolverResult(
-            success=True,
-            schedules=[schedule],
-            penalties=[penalty],
-            unsatisfiable_constraints=[],
-        )
-    else:
-        # Infeasible or timeout
-        unsatisfiable = _diagnose_infeasibility(
-            model, staff_list, shifts, min_participation_info
-        )
-        return SolverResult(
-            success=False,
-            schedules=[],
-            penalties=[],
-            unsatisfiable_constraints=unsatisfiable,
-        )
+        for run_start, run_end in _consecutive_date_runs(dates):
+            if run_end - run_start >= min_consecutive:
+                continue
+            if has_trailing and dates[run_start] == night_dates[0]:
+                continue
+            for k in positions[run_start:run_end]:
+                staff_eligible[night_idx[k]] = False
 
 
 def _add_weekend_isolation_constraints(
     model: cp_model.CpModel,
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar],
+    x: list[cp_model.IntVar | None],
+    n_shifts: int,
     staff_list: list[Staff],
-    weekend_shifts: list[Shift],
-    night_shifts: list[Shift],
+    shifts: list[Shift],
+    weekend_idx: list[int],
+    shift_idx_by_date: dict[date, list[int]],
 ) -> None:
     """Ensure weekend shifts are isolated (not adjacent to other shifts).
     
     A weekend shift cannot be on the same day or adjacent day to any other shift
     for the same person. This prevents weekend shifts from being part of blocks.
     """
-    # Group shifts by date
-    shifts_by_date: dict[date, list[Shift]] = defaultdict(list)
-    for s in weekend_shifts + night_shifts:
-        shifts_by_date[s.shift_date].append(s)
-    
-    all_dates = sorted(shifts_by_date.keys())
-    
-    for staff in staff_list:
-        for we_shift in weekend_shifts:
-            we_key = (staff.identifier, we_shift.shift_date, we_shift.shift_type)
-            if we_key not in x:
+    # Adjacent (weekend shift, other shift) index pairs, built once for all staff.
+    # Weekend/weekend pairs are kept only in forward direction to avoid posting
+    # the same constraint twice.
+    adjacent_pairs: list[tuple[int, int]] = []
+    for we_i in weekend_idx:
+        we_date = shifts[we_i].shift_date
+        for adj_date in (we_date - timedelta(days=1), we_date + timedelta(days=1)):
+            for other_i in shift_idx_by_date.get(adj_date, ()):
+                if shifts[other_i].is_weekend_shift() and adj_date < we_date:
+                    continue
+                adjacent_pairs.append((we_i, other_i))
+
+    for s_idx in range(len(staff_list)):
+        row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
+        for we_i, other_i in adjacent_pairs:
+            we_var = row[we_i]
+            if we_var is None:
                 continue
-            
-            we_date = we_shift.shift_date
-            prev_date = we_date - timedelta(days=1)
-            next_date = we_date + timedelta(days=1)
-            
-            # Cannot have shifts on adjacent days
-            for adj_date in [prev_date, next_date]:
-                if adj_date in shifts_by_date:
-                    for other_shift in shifts_by_date[adj_date]:
-                        other_key = (staff.identifier, other_shift.shift_date, other_shift.shift_type)
-                        if other_key in x and other_key != we_key:
-                            # Weekend shift and adjacent shift cannot both be assigned
-                            model.Add(x[we_key] + x[other_key] <= 1)
+            other_var = row[other_i]
+            if other_var is not None:
+                # Weekend shift and adjacent shift cannot both be assigned
+                model.AddAtMostOne([we_var, other_var])
 
 
 def _add_block_constraints(
     model: cp_model.CpModel,
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar],
+    day_vars: list[dict[date, list[cp_model.IntVar]]],
     staff_list: list[Staff],
-    shifts: list[Shift],
     quarter_start: date,
     quarter_end: date,
     trailing_work_dates: dict[str, set[date]] | None = None,
@@ -639,52 +869,35 @@ def _add_block_constraints(
     - D1 and D2 are both "block starts" (no work on D1-1 and D2-1)
     - 2 <= D2 - D1 < 21
 
+    This is posted as one at-most-one over the block starts of each 21-day
+    window rather than one constraint per pair.
+
     When trailing_work_dates is provided, injects fixed work-day variables
     from the previous quarter (last 21 days) so the 3-week gap is
     enforced across the quarter boundary.
     """
-    # Group shifts by date
-    shifts_by_date: dict[date, list[Shift]] = defaultdict(list)
-    for s in shifts:
-        shifts_by_date[s.shift_date].append(s)
-
-    all_dates = sorted(shifts_by_date.keys())
-
-    for staff in staff_list:
-        # Get all dates where this staff has a possible assignment
-        staff_dates = []
-        for d in all_dates:
-            has_any = any(
-                (staff.identifier, s.shift_date, s.shift_type) in x
-                for s in shifts_by_date[d]
-            )
-            if has_any:
-                staff_dates.append(d)
-
-        if len(staff_dates) < 2 and not trailing_work_dates:
+    for staff, vars_by_date in zip(staff_list, day_vars, strict=True):
+        if len(vars_by_date) < 2 and not trailing_work_dates:
             continue
 
         # Create "works_on_D" variable (OR of all shifts on that date)
         works_on: dict[date, cp_model.IntVar] = {}
-        for d in staff_dates:
-            vars_on_d = [
-                x[(staff.identifier, s.shift_date, s.shift_type)]
-                for s in shifts_by_date[d]
-                if (staff.identifier, s.shift_date, s.shift_type) in x
-            ]
+        for d, vars_on_d in vars_by_date.items():
             if len(vars_on_d) == 1:
                 works_on[d] = vars_on_d[0]
-            elif len(vars_on_d) > 1:
+            else:
                 works_on[d] = model.NewBoolVar(f"works_{staff.identifier}_{d}")
-                model.AddMaxEquality(works_on[d], vars_on_d)
+                # works_on[d] = OR(vars_on_d) as linear dominance:
+                # works_on >= each shift variable, works_on <= their sum
+                for v in vars_on_d:
+                    model.Add(works_on[d] >= v)
+                model.Add(works_on[d] <= cp_model.LinearExpr.Sum(vars_on_d))
 
         # Inject trailing work dates as fixed variables (previous quarter)
         if trailing_work_dates:
             for d in trailing_work_dates.get(staff.identifier, set()):
                 if (quarter_start - d).days <= 21 and d < quarter_start:
-                    fixed = model.NewBoolVar(f"trail_work_{staff.identifier}_{d}")
-                    model.Add(fixed == 1)
-                    works_on[d] = fixed
+                    works_on[d] = model.NewConstant(1)
 
         # Use all known dates (trailing + current) for block start detection
         all_known_dates = sorted(works_on.keys())
@@ -696,32 +909,44 @@ def _add_block_constraints(
                 continue
             prev_d = d - timedelta(days=1)
             if prev_d in works_on:
-                # block_starts[d] = works_on[d] AND NOT works_on[prev_d]
-                block_starts[d] = model.NewBoolVar(f"block_start_{staff.identifier}_{d}")
-                not_prev = model.NewBoolVar(f"not_prev_{staff.identifier}_{d}")
-                model.Add(not_prev == 1 - works_on[prev_d])
-                model.AddBoolAnd([works_on[d], not_prev]).OnlyEnforceIf(block_starts[d])
-                model.AddBoolOr([works_on[d].Not(), not_prev.Not()]).OnlyEnforceIf(block_starts[d].Not())
+                # block_starts[d] = works_on[d] AND NOT works_on[prev_d],
+                # as three linear inequalities
+                start = model.NewBoolVar(f"block_start_{staff.identifier}_{d}")
+                model.Add(start <= works_on[d])
+                model.Add(start + works_on[prev_d] <= 1)
+                model.Add(start >= works_on[d] - works_on[prev_d])
+                block_starts[d] = start
             else:
                 # No previous day in schedule, so if working, it's a block start
                 block_starts[d] = works_on[d]
 
-        # Enforce: no two block starts within 21 days (3 weeks)
+        # Enforce: no two block starts within 21 days (3 weeks).
+        # One at-most-one per window [d1, d1 + 20] replaces the pairwise constraints.
+        # Windows are scanned with two pointers; a window whose end did not
+        # advance is contained in the previous one and is skipped.
+        # Dates as integer ordinals so the scan does no date arithmetic
         block_start_dates = sorted(block_starts.keys())
-        for i, d1 in enumerate(block_start_dates):
-            for d2 in block_start_dates[i + 1:]:
-                gap = (d2 - d1).days
-                if gap >= 21:
-                    break  # No need to check further
-                # Both being block starts is forbidden
-                model.Add(block_starts[d1] + block_starts[d2] <= 1)
+        start_vars = [block_starts[d] for d in block_start_dates]
+        ordinals = [d.toordinal() for d in block_start_dates]
+        end = 0
+        prev_end = 0
+        for i, ordinal in enumerate(ordinals):
+            while end < len(ordinals) and ordinals[end] - ordinal < 21:
+                end += 1
+            if end == prev_end:
+                continue
+            prev_end = end
+            if end - i > 1:
+                model.AddAtMostOne(start_vars[i:end])
 
 
 def _add_nd_max_consecutive_constraints(
     model: cp_model.CpModel,
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar],
+    x: list[cp_model.IntVar | None],
+    n_shifts: int,
     staff_list: list[Staff],
-    night_shifts: list[Shift],
+    night_idx: list[int],
+    night_dates: list[date],
     trailing_night_dates: dict[str, list[date]] | None = None,
 ) -> None:
     """Enforce max consecutive nights based on nd_max_consecutive field.
@@ -729,28 +954,25 @@ def _add_nd_max_consecutive_constraints(
     When trailing_night_dates is provided, prepends fixed night variables from
     the previous quarter so consecutive-night limits are enforced at boundary.
     """
-    sorted_nights = sorted(night_shifts, key=lambda s: s.shift_date)
-
-    for staff in staff_list:
+    for s_idx, staff in enumerate(staff_list):
         if not staff.nd_possible or staff.nd_max_consecutive is None:
             continue
 
         max_consecutive = staff.nd_max_consecutive
 
         # Get this staff's night variables in order
-        staff_night_vars: list[tuple[date, cp_model.IntVar]] = []
-        for shift in sorted_nights:
-            key = (staff.identifier, shift.shift_date, shift.shift_type)
-            if key in x:
-                staff_night_vars.append((shift.shift_date, x[key]))
+        row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
+        staff_night_vars: list[tuple[date, cp_model.IntVar]] = [
+            (d, var)
+            for i, d in zip(night_idx, night_dates, strict=True)
+            if (var := row[i]) is not None
+        ]
 
         # Prepend trailing night dates as fixed variables
         if trailing_night_dates and staff.identifier in trailing_night_dates:
             trailing_vars: list[tuple[date, cp_model.IntVar]] = []
             for d in trailing_night_dates[staff.identifier]:
-                fixed = model.NewBoolVar(f"trail_maxnd_{staff.identifier}_{d}")
-                model.Add(fixed == 1)
-                trailing_vars.append((d, fixed))
+                trailing_vars.append((d, model.NewConstant(1)))
             staff_night_vars = trailing_vars + staff_night_vars
 
         if len(staff_night_vars) <= max_consecutive:
@@ -758,36 +980,44 @@ def _add_nd_max_consecutive_constraints(
 
         # For each window of (max_consecutive + 1) consecutive dates,
         # enforce sum <= max_consecutive
-        i = 0
-        while i < len(staff_night_vars):
-            window_vars = []
-            window_start = staff_night_vars[i][0]
-            j = i
-
-            # Collect consecutive dates starting from i
-            while j < len(staff_night_vars):
-                d, var = staff_night_vars[j]
-                if j == i or (d - staff_night_vars[j - 1][0]).days == 1:
-                    window_vars.append(var)
-                    j += 1
-                else:
-                    break
+        night_vars = [var for _, var in staff_night_vars]
+        runs = _consecutive_date_runs([d for d, _ in staff_night_vars])
+        for run_start, run_end in runs:
+            # Sum of (max_consecutive + 1) consecutive vars <= max_consecutive
+            for k in range(run_start, run_end - max_consecutive):
+                model.Add(
+                    cp_model.LinearExpr.Sum(night_vars[k : k + max_consecutive + 1])
+                    <= max_consecutive
+                )
 
-            # If window is longer than max_consecutive, add sliding constraints
-            if len(window_vars) > max_consecutive:
-                for k in range(len(window_vars) - max_consecutive):
-                    # Sum of (max_consecutive + 1) consecutive vars <= max_consecutive
-                    constraint_vars = window_vars[k : k + max_consecutive + 1]
-                    model.Add(sum(constraint_vars) <= max_consecutive)
 
-            i = j
+def _consecutive_date_runs(dates: list[date]) -> list[tuple[int, int]]:
+    """Split an ordered date list into runs of consecutive days.
+
+    Returns half-open index ranges ``(start, end)`` into ``dates``. Works on
+    date ordinals only, so the result can be computed before any model
+    variables are touched.
+    """
+    runs: list[tuple[int, int]] = []
+    if not dates:
+        return runs
+    ordinals = [d.toordinal() for d in dates]
+    run_start = 0
+    for i in range(1, len(ordinals)):
+        if ordinals[i] - ordinals[i - 1] != 1:
+            runs.append((run_start, i))
+            run_start = i
+    runs.append((run_start, len(ordinals)))
+    return runs
 
 
 def _add_min_consecutive_nights_constraints(
     model: cp_model.CpModel,
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar],
+    x: list[cp_model.IntVar | None],
+    n_shifts: int,
     staff_list: list[Staff],
-    night_shifts: list[Shift],
+    night_idx: list[int],
+    night_dates: list[date],
     trailing_night_dates: dict[str, list[date]] | None = None,
 ) -> None:
     """Enforce minimum consecutive nights based on staff.nd_min_consecutive.
@@ -803,9 +1033,7 @@ def _add_min_consecutive_nights_constraints(
     When trailing_night_dates is provided, prepends fixed night variables from
     the previous quarter so min-consecutive is respected at boundary.
     """
-    sorted_nights = sorted(night_shifts, key=lambda s: s.shift_date)
-    
-    for staff in staff_list:
+    for s_idx, staff in enumerate(staff_list):
         if not staff.nd_possible:
             continue
         
@@ -816,19 +1044,18 @@ def _add_min_consecutive_nights_constraints(
             continue
         
         # Get this staff's night variables in order
-        staff_night_vars: list[tuple[date, cp_model.IntVar]] = []
-        for shift in sorted_nights:
-            key = (staff.identifier, shift.shift_date, shift.shift_type)
-            if key in x:
-                staff_night_vars.append((shift.shift_date, x[key]))
+        row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
+        staff_night_vars: list[tuple[date, cp_model.IntVar]] = [
+            (d, var)
+            for i, d in zip(night_idx, night_dates, strict=True)
+            if (var := row[i]) is not None
+        ]
 
         # Prepend trailing night dates as fixed variables
         if trailing_night_dates and staff.identifier in trailing_night_dates:
             trailing_vars: list[tuple[date, cp_model.IntVar]] = []
             for d in trailing_night_dates[staff.identifier]:
-                fixed = model.NewBoolVar(f"trail_minnd_{staff.identifier}_{d}")
-                model.Add(fixed == 1)
-                trailing_vars.append((d, fixed))
+                trailing_vars.append((d, model.NewConstant(1)))
             staff_night_vars = trailing_vars + staff_night_vars
         
         if len(staff_night_vars) < min_consecutive:
@@ -840,28 +1067,27 @@ def _add_min_consecutive_nights_constraints(
         # other nights within the same contiguous block
         
         if min_consecutive == 2:
-            # Simple case: each night needs at least one adjacent night
-            for i, (d, var) in enumerate(staff_night_vars):
-                adjacent_vars = []
-                
-                # Check previous day
-                if i > 0:
-                    prev_d, prev_var = staff_night_vars[i - 1]
-                    if (d - prev_d).days == 1:
-                        adjacent_vars.append(prev_var)
-                
-                # Check next day
-                if i < len(staff_night_vars) - 1:
-                    next_d, next_var = staff_night_vars[i + 1]
-                    if (next_d - d).days == 1:
-                        adjacent_vars.append(next_var)
-                
-                if adjacent_vars:
-                    # var => OR(adjacent_vars)
-                    model.Add(sum(adjacent_vars) >= 1).OnlyEnforceIf(var)
-                else:
+            # Simple case: each night needs at least one adjacent night.
+            # Neighbours come from the runs of consecutive dates, so no per-night
+            # date arithmetic is needed.
+            night_vars = [var for _, var in staff_night_vars]
+            isolated_vars = []
+            for run_start, run_end in _consecutive_date_runs([d for d, _ in staff_night_vars]):
+                if run_end - run_start == 1:
                     # No adjacent nights available - cannot work this night
-                    model.Add(var == 0)
+                    isolated_vars.append(night_vars[run_start])
+                    continue
+                # Run ends: var => the single neighbour (binary implication)
+                model.AddImplication(night_vars[run_start], night_vars[run_start + 1])
+                model.AddImplication(night_vars[run_end - 1], night_vars[run_end - 2])
+                # Run interior: var => OR(prev, next)
+                for k in range(run_start + 1, run_end - 1):
+                    model.AddBoolOr([night_vars[k - 1], night_vars[k + 1]]).OnlyEnforceIf(
+                        night_vars[k]
+                    )
+            if isolated_vars:
+                # Fix all isolated nights to 0 in one constraint
+                model.AddBoolAnd([v.Not() for v in isolated_vars])
         else:
             # General case for min_consecutive >= 3
             # For each night, if assigned, it must be part of a block of at least min_consecutive
@@ -871,9 +1097,11 @@ def _add_min_consecutive_nights_constraints(
 
 def _add_abteilung_night_constraints(
     model: cp_model.CpModel,
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar],
+    x: list[cp_model.IntVar | None],
+    n_shifts: int,
     staff_list: list[Staff],
-    night_shifts: list[Shift],
+    night_idx: list[int],
+    night_idx_by_date: dict[date, list[int]],
 ) -> None:
     """Enforce abteilung separation on night shifts.
     
@@ -884,60 +1112,53 @@ def _add_abteilung_night_constraints(
     This prevents capacity shortages in specialized departments.
     Employees in abteilung="other" are exempt from this rule.
     """
-    sorted_nights = sorted(night_shifts, key=lambda s: s.shift_date)
-    
     # Only apply to staff in "op" or "station" abteilung
     restricted_abteilungen = {Abteilung.OP, Abteilung.STATION}
     
-    # Group staff by abteilung
-    staff_by_abteilung: dict[Abteilung, list[Staff]] = defaultdict(list)
-    for staff in staff_list:
+    # Group staff rows by abteilung
+    rows_by_abteilung: dict[Abteilung, list[list[cp_model.IntVar | None]]] = defaultdict(list)
+    for s_idx, staff in enumerate(staff_list):
         if staff.nd_possible and staff.abteilung in restricted_abteilungen:
-            staff_by_abteilung[staff.abteilung].append(staff)
+            rows_by_abteilung[staff.abteilung].append(x[s_idx * n_shifts:(s_idx + 1) * n_shifts])
     
     # For each restricted abteilung, add constraints
-    for abteilung, abt_staff in staff_by_abteilung.items():
-        if len(abt_staff) < 2:
+    for abteilung, abt_rows in rows_by_abteilung.items():
+        if len(abt_rows) < 2:
             continue  # No constraint needed if only 1 person in abteilung
         
         # 1. Same night constraint: no two staff from same abteilung on same night
-        for shift in sorted_nights:
-            vars_for_shift = []
-            for staff in abt_staff:
-                key = (staff.identifier, shift.shift_date, shift.shift_type)
-                if key in x:
-                    vars_for_shift.append(x[key])
+        for shift_idx in night_idx:
+            vars_for_shift = [row[shift_idx] for row in abt_rows if row[shift_idx] is not None]
             
             # At most 1 person from this abteilung per night
             if len(vars_for_shift) >= 2:
-                model.Add(sum(vars_for_shift) <= 1)
+                model.AddAtMostOne(vars_for_shift)
         
-        # 2. Consecutive nights constraint: no two staff from same abteilung on consecutive days
-        for i, shift in enumerate(sorted_nights):
-            # Find next day's night shifts
-            next_day = shift.shift_date + timedelta(days=1)
-            next_day_shifts = [s for s in sorted_nights if s.shift_date == next_day]
-            
-            if not next_day_shifts:
+        # 2. Consecutive nights constraint: no two staff from same abteilung on consecutive days.
+        # Per staff member and date: own night on day N excludes every other
+        # member's night on day N+1 (same person on consecutive nights is allowed).
+        # Other members on N+1 already sum to <= 1, so one constraint per staff
+        # and date subsumes all pairwise constraints.
+        for d, day_idx in night_idx_by_date.items():
+            next_day_idx = night_idx_by_date.get(d + timedelta(days=1))
+            if not next_day_idx:
                 continue
-            
-            # For each pair of staff in same abteilung
-            for staff1 in abt_staff:
-                key1 = (staff1.identifier, shift.shift_date, shift.shift_type)
-                if key1 not in x:
+
+            next_vars_by_row = [
+                [row[i] for i in next_day_idx if row[i] is not None] for row in abt_rows
+            ]
+            for j, row in enumerate(abt_rows):
+                day_vars = [row[i] for i in day_idx if row[i] is not None]
+                if not day_vars:
                     continue
-                
-                for staff2 in abt_staff:
-                    if staff1.identifier == staff2.identifier:
-                        continue  # Same person, handled by single-assignment constraint
-                    
-                    for next_shift in next_day_shifts:
-                        key2 = (staff2.identifier, next_shift.shift_date, next_shift.shift_type)
-                        if key2 not in x:
-                            continue
-                        
-                        # staff1 on day N and staff2 on day N+1 cannot both be true
-                        model.Add(x[key1] + x[key2] <= 1)
+                others_next = [
+                    v
+                    for k, next_vars in enumerate(next_vars_by_row)
+                    if k != j
+                    for v in next_vars
+                ]
+                if others_next:
+                    model.AddAtMostOne(day_vars + others_next)
 
 
 def _add_group_fairness_objective(
@@ -962,33 +1183,32 @@ def _add_group_fairness_objective(
     if len(group) < 2:
         return
 
-    # Create scaled count variables: count * (scale / hours)
+    # Scaled count expressions: count * (scale / hours)
     # This FTE-normalizes the counts so a 20h employee with 5 shifts
     # equals a 40h employee with 10 shifts.
-    scaled_counts = []
+    scaled_counts: list[cp_model.LinearExprT] = []
     for staff in group:
         count_expr = counts.get(staff.identifier, 0)
         if isinstance(count_expr, int) and count_expr == 0:
-            # Zero count, skip
-            scaled_var = model.NewIntVar(0, 0, f"{prefix}_scaled_{staff.identifier}")
+            # Zero count: a constant is enough
+            scaled_counts.append(0)
         else:
             # scaled = count * (scale / hours) = count * scale / hours
             # Since scale=400 and hours in [18,40], multiplier in [10,22]
-            multiplier = scale // staff.hours
-            max_possible = 100 * multiplier  # Conservative upper bound
-            scaled_var = model.NewIntVar(0, max_possible, f"{prefix}_scaled_{staff.identifier}")
-            model.Add(scaled_var == count_expr * multiplier)
-        scaled_counts.append(scaled_var)
-
-    # Create max and min variables
-    max_var = model.NewIntVar(0, 10000, f"{prefix}_max")
-    min_var = model.NewIntVar(0, 10000, f"{prefix}_min")
-    model.AddMaxEquality(max_var, scaled_counts)
-    model.AddMinEquality(min_var, scaled_counts)
-
-    # Range = max - min
-    range_var = model.NewIntVar(0, 10000, f"{prefix}_range")
-    model.Add(range_var == max_var - min_var)
+            scaled_counts.append(count_expr * (scale // staff.hours))
+
+    # Max and min as linear bounds on every scaled count. Minimizing the range
+    # pulls them tight, so no max/min equality is needed.
+    # Domain: at most 100 half-units per person, scaled by the largest multiplier
+    upper = min(10000, max(100 * (scale // staff.hours) for staff in group))
+    max_var = model.NewIntVar(0, upper, f"{prefix}_max")
+    min_var = model.NewIntVar(0, upper, f"{prefix}_min")
+    for scaled in scaled_counts:
+        model.Add(max_var >= scaled)
+        model.Add(min_var <= scaled)
+
+    # Range = max - min, used directly as a linear expression
+    range_expr = max_var - min_var
 
     # HARD CONSTRAINT: Enforce maximum allowed deviation
     # Threshold is in scaled units. Since counts are in half-units (1 Notdienst = 2),
@@ -996,10 +1216,10 @@ def _add_group_fairness_objective(
     # So max_fte_deviation=1.5 Notdienste = 1.5 * 20 = 30 scaled units for 40h.
     # We use 40h as reference (the "full-time equivalent").
     threshold_scaled = int(max_fte_deviation * 2 * (scale // 40))
-    model.Add(range_var <= threshold_scaled)
+    model.Add(range_expr <= threshold_scaled)
 
     # SOFT OBJECTIVE: Minimize range further (tightest possible fairness)
-    objective_terms.append(range_var)
+    objective_terms.append(range_expr)
 
 
 def _add_group_fairness_objective_with_presence(
@@ -1012,6 +1232,7 @@ def _add_group_fairness_objective_with_presence(
     prefix: str,
     max_fte_deviation: float = 1.5,
     carry_forward_deltas: dict[str, float] | None = None,
+    assumptions: dict[str, cp_model.IntVar] | None = None,
 ) -> None:
     """Add min-max fairness objective with presence (vacation) adjustment.
 
@@ -1026,6 +1247,9 @@ def _add_group_fairness_objective_with_presence(
     The delta is in Norm./40h units and is converted to the solver's internal
     scaled integer space via the constant factor CARRY_FORWARD_SCALE = 20
     (derived from scale=400, counts in half-units).
+
+    When assumptions is provided, the hard deviation limit is guarded by a
+    new assumption literal registered there.
     """
     if len(group) < 2:
         return
@@ -1038,7 +1262,10 @@ def _add_group_fairness_objective_with_presence(
         carry_forward_deltas.get(s.identifier, 0.0) != 0.0 for s in group
     )
 
-    scaled_counts = []
+    scaled_counts: list[cp_model.LinearExprT] = []
+    # Bounds of the scaled counts (at most 100 half-units per person), used
+    # as the domain of max_var/min_var
+    lower, upper = 0, 0
     for staff in group:
         count_expr = counts.get(staff.identifier, 0)
         presence = presence_factors.get(staff.identifier, PRESENCE_SCALE)
@@ -1046,8 +1273,12 @@ def _add_group_fairness_objective_with_presence(
         if presence == 0:
             presence = 1
         
+        cf_offset = int(round(
+            (carry_forward_deltas or {}).get(staff.identifier, 0.0) * CARRY_FORWARD_SCALE
+        ))
         if isinstance(count_expr, int) and count_expr == 0:
-            scaled_var = model.NewIntVar(0, 0, f"{prefix}_scaled_{staff.identifier}")
+            scaled: cp_model.LinearExprT = 0
+            max_scaled = 0
         else:
             # scaled = count * (scale / hours) * (PRESENCE_SCALE / presence)
             # = count * scale * PRESENCE_SCALE / (hours * presence)
@@ -1056,33 +1287,27 @@ def _add_group_fairness_objective_with_presence(
             # presence_multiplier = PRESENCE_SCALE * 10 // presence (extra 10 for precision)
             presence_multiplier = (PRESENCE_SCALE * 10) // presence
             combined_multiplier = hours_multiplier * presence_multiplier // 10
-            
-            max_possible = 100 * combined_multiplier
-            scaled_var = model.NewIntVar(0, max_possible, f"{prefix}_scaled_{staff.identifier}")
-            model.Add(scaled_var == count_expr * combined_multiplier)
+            scaled = count_expr * combined_multiplier
+            max_scaled = 100 * combined_multiplier
 
         # Apply carry-forward offset (previous quarter imbalance)
-        cf_delta = (carry_forward_deltas or {}).get(staff.identifier, 0.0)
-        if cf_delta != 0.0:
-            cf_offset = int(round(cf_delta * CARRY_FORWARD_SCALE))
-            lb = min(0, cf_offset - 500)
-            ub = 100000 + abs(cf_offset)
-            adjusted_var = model.NewIntVar(
-                lb, ub, f"{prefix}_adj_{staff.identifier}"
-            )
-            model.Add(adjusted_var == scaled_var + cf_offset)
-            scaled_counts.append(adjusted_var)
-        else:
-            scaled_counts.append(scaled_var)
-
-    min_bound = -10000 if has_carry_forward else 0
-    max_var = model.NewIntVar(min_bound, 100000, f"{prefix}_max")
-    min_var = model.NewIntVar(min_bound, 100000, f"{prefix}_min")
-    model.AddMaxEquality(max_var, scaled_counts)
-    model.AddMinEquality(min_var, scaled_counts)
-
-    range_var = model.NewIntVar(0, 100000, f"{prefix}_range")
-    model.Add(range_var == max_var - min_var)
+        if cf_offset != 0:
+            scaled = scaled + cf_offset
+        scaled_counts.append(scaled)
+        lower = min(lower, cf_offset)
+        upper = max(upper, max_scaled + cf_offset)
+
+    # Max and min as linear bounds on every scaled count (pulled tight by
+    # the range objective)
+    min_bound = max(-10000, lower) if has_carry_forward else 0
+    upper = min(100000, upper)
+    max_var = model.NewIntVar(min_bound, upper, f"{prefix}_max")
+    min_var = model.NewIntVar(min_bound, upper, f"{prefix}_min")
+    for scaled in scaled_counts:
+        model.Add(max_var >= scaled)
+        model.Add(min_var <= scaled)
+
+    range_expr = max_var - min_var
 
     # Hard constraint threshold (adjusted for presence scaling)
     threshold_scaled = int(max_fte_deviation * 2 * (scale // 40) * (PRESENCE_SCALE // 100))
@@ -1091,9 +1316,13 @@ def _add_group_fairness_objective_with_presence(
         group_cfs = [carry_forward_deltas.get(s.identifier, 0.0) for s in group]
         cf_spread = max(group_cfs) - min(group_cfs)
         threshold_scaled += int(round(cf_spread * CARRY_FORWARD_SCALE))
-    model.Add(range_var <= threshold_scaled)
+    limit = model.Add(range_expr <= threshold_scaled)
+    if assumptions is not None:
+        lit = model.NewBoolVar(f"assume_{prefix}_fairness")
+        assumptions[f"Fairness limit ({max_fte_deviation} FTE) for group {prefix}"] = lit
+        limit.OnlyEnforceIf(lit)
 
-    objective_terms.append(range_var)
+    objective_terms.append(range_expr)
 
 
 def _add_type_balance_objective(
@@ -1116,7 +1345,8 @@ def _add_type_balance_objective(
 
     PRESENCE_SCALE = 1000
     
-    scaled_counts = []
+    scaled_counts: list[cp_model.LinearExprT] = []
+    upper = 0  # Nights only: at most 50 half-units per person
     for staff in group:
         count_expr = night_counts.get(staff.identifier, 0)
         presence = presence_factors.get(staff.identifier, PRESENCE_SCALE)
@@ -1124,27 +1354,23 @@ def _add_type_balance_objective(
             presence = 1
         
         if isinstance(count_expr, int) and count_expr == 0:
-            scaled_var = model.NewIntVar(0, 0, f"{prefix}_scaled_{staff.identifier}")
+            scaled_counts.append(0)
         else:
             hours_multiplier = scale // staff.hours
             presence_multiplier = (PRESENCE_SCALE * 10) // presence
             combined_multiplier = hours_multiplier * presence_multiplier // 10
-            
-            max_possible = 50 * combined_multiplier  # Nights only, so lower max
-            scaled_var = model.NewIntVar(0, max_possible, f"{prefix}_scaled_{staff.identifier}")
-            model.Add(scaled_var == count_expr * combined_multiplier)
-        scaled_counts.append(scaled_var)
+            scaled_counts.append(count_expr * combined_multiplier)
+            upper = max(upper, 50 * combined_multiplier)
+    upper = min(50000, upper)
 
-    max_var = model.NewIntVar(0, 50000, f"{prefix}_max")
-    min_var = model.NewIntVar(0, 50000, f"{prefix}_min")
-    model.AddMaxEquality(max_var, scaled_counts)
-    model.AddMinEquality(min_var, scaled_counts)
+    max_var = model.NewIntVar(0, upper, f"{prefix}_max")
+    min_var = model.NewIntVar(0, upper, f"{prefix}_min")
+    for scaled in scaled_counts:
+        model.Add(max_var >= scaled)
+        model.Add(min_var <= scaled)
 
-    range_var = model.NewIntVar(0, 50000, f"{prefix}_range")
-    model.Add(range_var == max_var - min_var)
-
-    # Add weighted to objective (no hard constraint, just soft optimization)
-    objective_terms.append(weight * range_var)
+    # Add weighted range to objective (no hard constraint, just soft optimization)
+    objective_terms.append(weight * (max_var - min_var))
 
 
 def _add_min_block_constraint(
@@ -1159,51 +1385,44 @@ def _add_min_block_constraint(
     - nights i-1, i, i+1 are all assigned (i is in middle), OR
     - nights i, i+1, i+2 are all assigned (block starts at i)
     
-    This generalizes to any min_consecutive value.
+    This generalizes to any min_consecutive value. Candidate blocks are the
+    windows inside runs of consecutive dates; each gets one indicator shared
+    by all nights it covers.
     """
-    n = len(staff_night_vars)
-    
-    for i, (d, var) in enumerate(staff_night_vars):
-        # Find all possible blocks of min_consecutive that include position i
-        valid_block_indicators = []
-        
-        for block_start in range(max(0, i - min_consecutive + 1), min(n - min_consecutive + 1, i + 1)):
+    night_vars = [var for _, var in staff_night_vars]
+
+    for run_start, run_end in _consecutive_date_runs([d for d, _ in staff_night_vars]):
+        if run_end - run_start < min_consecutive:
+            # No valid blocks fit in this run - none of its nights can be assigned
+            model.AddBoolAnd([v.Not() for v in night_vars[run_start:run_end]])
+            continue
+
+        # Indicators of the blocks covering each night of the run
+        covering: list[list[cp_model.IntVar]] = [[] for _ in range(run_start, run_end)]
+        for block_start in range(run_start, run_end - min_consecutive + 1):
             block_end = block_start + min_consecutive
-            
-            # Check if this is a valid contiguous block (consecutive dates)
-            block_vars = []
-            is_contiguous = True
+            block_indicator = model.NewBoolVar(
+                f"block_{staff_night_vars[block_start][0]}_{block_start}"
+            )
+            # Active block => all its nights are assigned
+            model.AddBoolAnd(night_vars[block_start:block_end]).OnlyEnforceIf(block_indicator)
             for j in range(block_start, block_end):
-                if j > block_start:
-                    prev_date = staff_night_vars[j - 1][0]
-                    curr_date = staff_night_vars[j][0]
-                    if (curr_date - prev_date).days != 1:
-                        is_contiguous = False
-                        break
-                block_vars.append(staff_night_vars[j][1])
-            
-            if is_contiguous and len(block_vars) == min_consecutive:
-                # Create indicator for "all vars in block are assigned"
-                block_indicator = model.NewBoolVar(f"block_{d}_{block_start}")
-                # block_indicator = 1 iff all block_vars = 1
-                model.Add(sum(block_vars) == min_consecutive).OnlyEnforceIf(block_indicator)
-                model.Add(sum(block_vars) < min_consecutive).OnlyEnforceIf(block_indicator.Not())
-                valid_block_indicators.append(block_indicator)
-        
-        if valid_block_indicators:
-            # If var is assigned, at least one valid block must be active
-            model.Add(sum(valid_block_indicators) >= 1).OnlyEnforceIf(var)
-        else:
-            # No valid blocks include this position - cannot be assigned
-            model.Add(var == 0)
+                covering[j - run_start].append(block_indicator)
+
+        for offset, indicators in enumerate(covering):
+            # If the night is assigned, at least one block covering it must be active
+            model.AddBoolOr(indicators).OnlyEnforceIf(night_vars[run_start + offset])
 
 
 def _add_min_participation_constraints(
     model: cp_model.CpModel,
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar],
+    x: list[cp_model.IntVar | None],
+    n_shifts: int,
     staff_list: list[Staff],
-    weekend_shifts: list[Shift],
-    night_shifts: list[Shift],
+    weekend_idx: list[int],
+    night_idx: list[int],
+    has_eligible_night: list[bool],
+    assumptions: dict[str, cp_model.IntVar] | None = None,
 ) -> dict[str, dict[str, bool]]:
     """Add hard constraints for minimum shift participation.
     
@@ -1211,32 +1430,35 @@ def _add_min_participation_constraints(
     - 1 weekend shift (if eligible for any weekend shift type)
     - 1 night shift (if nd_possible=True AND has sufficient availability)
     
+    has_eligible_night[s_idx] says whether the staff member was eligible for
+    any night before short runs were pruned; the night requirement follows it.
+
+    When assumptions is provided, each requirement is guarded by a new
+    assumption literal registered there.
+
     Returns dict tracking which constraints were applied per staff for diagnostics.
     """
     participation_info: dict[str, dict[str, bool]] = {}
     
-    for staff in staff_list:
+    for s_idx, staff in enumerate(staff_list):
         info: dict[str, bool] = {"weekend_required": False, "night_required": False}
+        row = x[s_idx * n_shifts:(s_idx + 1) * n_shifts]
         
         # Weekend participation: TFA and Azubi who can work any weekend shift
-        weekend_vars = [
-            x[(staff.identifier, s.shift_date, s.shift_type)]
-            for s in weekend_shifts
-            if (staff.identifier, s.shift_date, s.shift_type) in x
-        ]
+        weekend_vars = [row[i] for i in weekend_idx if row[i] is not None]
         
         if weekend_vars and staff.beruf != Beruf.INTERN:
             # Require at least 1 weekend shift
-            model.Add(sum(weekend_vars) >= 1)
+            required = model.Add(cp_model.LinearExpr.Sum(weekend_vars) >= 1)
+            if assumptions is not None:
+                lit = model.NewBoolVar(f"assume_weekend_{staff.identifier}")
+                assumptions[f"Minimum 1 weekend shift for {staff.name}"] = lit
+                required.OnlyEnforceIf(lit)
             info["weekend_required"] = True
         
         # Night participation: staff with nd_possible=True
         if staff.nd_possible:
-            night_vars = [
-                x[(staff.identifier, s.shift_date, s.shift_type)]
-                for s in night_shifts
-                if (staff.identifier, s.shift_date, s.shift_type) in x
-            ]
+            night_vars = [row[i] for i in night_idx if row[i] is not None]
             
             # Only require if they have enough availability for min_consecutive requirement
             # Count available consecutive night opportunities
@@ -1244,8 +1466,12 @@ def _add_min_participation_constraints(
             available_night_types = 7 - len(staff.nd_exceptions)
             
             # Heuristic: if available types >= min_consecutive, they can likely form a block
-            if night_vars and available_night_types >= min_consec:
-                model.Add(sum(night_vars) >= 1)
+            if has_eligible_night[s_idx] and available_night_types >= min_consec:
+                required = model.Add(cp_model.LinearExpr.Sum(night_vars) >= 1)
+                if assumptions is not None:
+                    lit = model.NewBoolVar(f"assume_night_{staff.identifier}")
+                    assumptions[f"Minimum 1 night shift for {staff.name}"] = lit
+                    required.OnlyEnforceIf(lit)
                 info["night_required"] = True
         
         participation_info[staff.identifier] = info
@@ -1253,24 +1479,83 @@ def _add_min_participation_constraints(
     return participation_info
 
 
+def _greedy_initial_assignment(
+    staff_list: list[Staff],
+    shifts: list[Shift],
+    eligible: list[list[bool]],
+) -> list[int]:
+    """Build a round-robin assignment used as a solution hint.
+
+    Shifts are handed out in date order to the eligible staff member with the
+    lowest FTE-weighted load (shifts per contract hour) who is still free
+    that day; ties go to higher contract hours. Nights get one non-Azubi; on regular
+    nights a partner is added for staff who may not work alone. Only these
+    basic rules are respected, the solver repairs the rest.
+
+    Returns 0/1 values in the same flat layout as the assignment variables.
+    """
+    n_shifts = len(shifts)
+    hint = [0] * (len(staff_list) * n_shifts)
+    # FTE-weighted load: each shift adds 1/hours, so a 20h employee reaches
+    # the load of a 40h employee with half the shifts
+    load = [0.0] * len(staff_list)
+    shift_load = [1 / staff.hours for staff in staff_list]
+    tie_break = [-staff.hours for staff in staff_list]
+    busy_on: dict[date, set[int]] = defaultdict(set)
+
+    def pick(shift_idx: int, allowed: Callable[[Staff], bool]) -> int | None:
+        busy = busy_on[shifts[shift_idx].shift_date]
+        candidates = [
+            s_idx for s_idx, staff in enumerate(staff_list)
+            if eligible[s_idx][shift_idx] and s_idx not in busy and allowed(staff)
+        ]
+        if not candidates:
+            return None
+        # Least-loaded first; ties go to more hours, then list order
+        chosen = min(candidates, key=lambda s_idx: (load[s_idx], tie_break[s_idx]))
+        hint[chosen * n_shifts + shift_idx] = 1
+        load[chosen] += shift_load[chosen]
+        busy.add(chosen)
+        return chosen
+
+    for shift_idx in range(n_shifts):  # shifts are in date order
+        shift = shifts[shift_idx]
+        if not shift.is_night_shift():
+            pick(shift_idx, lambda staff: True)
+            continue
+
+        chosen = pick(shift_idx, lambda staff: staff.beruf != Beruf.AZUBI)
+        is_vet_present = shift.shift_type in (ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE)
+        if chosen is not None and not is_vet_present and not staff_list[chosen].nd_alone:
+            pick(shift_idx, lambda staff: not staff.nd_alone)
+
+    return hint
+
+
 def _extract_schedule(
     solver: cp_model.CpSolver,
-    x: dict[tuple[str, date, ShiftType], cp_model.IntVar],
-    is_paired: dict[tuple[str, date], cp_model.IntVar],
+    x: list[cp_model.IntVar | None],
+    staff_list: list[Staff],
     shifts: list[Shift],
     quarter_start: date,
     quarter_end: date,
 ) -> Schedule:
     """Extract Schedule object from solver solution."""
     assignments = []
-
-    for shift in shifts:
-        assigned_staff = []
-        for (staff_id, shift_date, shift_type), var in x.items():
-            if shift_date == shift.shift_date and shift_type == shift.shift_type:
-                if solver.Value(var) == 1:
-                    assigned_staff.append(staff_id)
-
+    n_shifts = len(shifts)
+    # Solution values fetched in one call, indexed by variable index
+    solution = solver.ResponseProto().solution
+
+    # Single pass over the flat assignment variables, bucketed by shift index
+    # (staff keep their list order within each shift)
+    assigned_by_shift: list[list[str]] = [[] for _ in range(n_shifts)]
+    for s_idx, staff in enumerate(staff_list):
+        base = s_idx * n_shifts
+        for shift_idx, var in enumerate(x[base:base + n_shifts]):
+            if var is not None and solution[var.Index()]:
+                assigned_by_shift[shift_idx].append(staff.identifier)
+
+    for shift, assigned_staff in zip(shifts, assigned_by_shift, strict=True):
         # Determine if paired (2 people on same night)
         paired = len(assigned_staff) >= 2 and shift.is_night_shift()
 
@@ -1299,50 +1584,56 @@ def _diagnose_infeasibility(
     """Attempt to diagnose why the model is infeasible."""
     issues = []
 
-    # Check basic capacity
-    weekend_shifts = [s for s in shifts if s.is_weekend_shift()]
-    night_shifts = [s for s in shifts if s.is_night_shift()]
+    # Single pass over the shifts: only the Sa_10-19 count is needed
+    sa_1019_count = sum(1 for s in shifts if s.shift_type == ShiftType.SATURDAY_10_19)
 
-    # Weekend capacity check
-    saturday_shifts = [s for s in weekend_shifts if s.shift_type.value.startswith("Sa_")]
-    sunday_shifts = [s for s in weekend_shifts if s.shift_type.value.startswith("So_")]
+    # Single pass over the staff: capacity counters plus per-staff findings
+    azubi_count = 0
+    adult_azubi_count = 0
+    non_azubi_nd_eligible_count = 0
+    min_consec_issues: list[str] = []
+    participation_issues: list[str] = []
+    for staff in staff_list:
+        if staff.beruf == Beruf.AZUBI:
+            azubi_count += 1
+            if staff.adult:
+                adult_azubi_count += 1
+        elif staff.nd_possible:
+            non_azubi_nd_eligible_count += 1
+
+        # Check for min consecutive nights constraint feasibility
+        if staff.nd_possible:
+            min_consec = staff.nd_min_consecutive
+            available_nights = 7 - len(staff.nd_exceptions)
+            if available_nights < min_consec and available_nights > 0:
+                min_consec_issues.append(
+                    f"{staff.name} ({staff.beruf.value}) has only {available_nights} available night types "
+                    f"but requires {min_consec} consecutive nights. Consider reducing nd_min_consecutive."
+                )
+
+        # Check participation constraints vs vacation/availability
+        if participation_info:
+            info = participation_info.get(staff.identifier, {})
+            if info.get("night_required") and len(staff.nd_exceptions) >= 5:
+                participation_issues.append(
+                    f"{staff.name} requires 1+ night shifts but has limited availability "
+                    f"({7 - len(staff.nd_exceptions)} night types). May conflict with vacation."
+                )
 
     # Saturday 10-19: Any Azubi can work this shift
-    sa_1019_eligible = [s for s in staff_list if s.beruf == Beruf.AZUBI]
-    if len(sa_1019_eligible) * 13 < len([s for s in saturday_shifts if s.shift_type == ShiftType.SATURDAY_10_19]):
-        issues.append(f"Insufficient Azubis for Sa_10-19 shifts. Have {len(sa_1019_eligible)}, need coverage for 13 weeks.")
+    if azubi_count * 13 < sa_1019_count:
+        issues.append(f"Insufficient Azubis for Sa_10-19 shifts. Have {azubi_count}, need coverage for 13 weeks.")
 
     # Sunday: adults only
-    adult_azubis = [s for s in staff_list if s.beruf == Beruf.AZUBI and s.adult]
-    if len(adult_azubis) == 0:
+    if adult_azubi_count == 0:
         issues.append("No adult Azubis available for Sunday So_8-20:30 shifts.")
 
     # Night capacity - need non-Azubis for all nights
-    non_azubi_nd_eligible = [s for s in staff_list if s.nd_possible and s.beruf != Beruf.AZUBI]
-    if len(non_azubi_nd_eligible) < 1:
+    if non_azubi_nd_eligible_count < 1:
         issues.append("Insufficient non-Azubi night-capable staff. Need at least 1 TFA or Intern per night.")
-    
-    # Check for min consecutive nights constraint feasibility
-    for staff in staff_list:
-        if not staff.nd_possible:
-            continue
-        min_consec = staff.nd_min_consecutive
-        available_nights = 7 - len(staff.nd_exceptions)
-        if available_nights < min_consec and available_nights > 0:
-            issues.append(
-                f"{staff.name} ({staff.beruf.value}) has only {available_nights} available night types "
-                f"but requires {min_consec} consecutive nights. Consider reducing nd_min_consecutive."
-            )
-    
-    # Check participation constraints vs vacation/availability
-    if participation_info:
-        for staff in staff_list:
-            info = participation_info.get(staff.identifier, {})
-            if info.get("night_required") and len(staff.nd_exceptions) >= 5:
-                issues.append(
-                    f"{staff.name} requires 1+ night shifts but has limited availability "
-                    f"({7 - len(staff.nd_exceptions)} night types). May conflict with vacation."
-                )
+
+    issues.extend(min_consec_issues)
+    issues.extend(participation_issues)
 
     if not issues:
         issues.append("Model infeasible. Check constraint interactions, vacation conflicts, or increase solve time.")
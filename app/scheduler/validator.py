@@ -1,24 +1,134 @@
 """Constraint validation for schedules."""
 
-from collections import defaultdict
-from datetime import timedelta
+import math
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from itertools import pairwise
 from typing import Any
 
-from .models import Abteilung, Assignment, Beruf, Schedule, ShiftType, Staff
+from .models import (
+    NIGHT_SHIFT_TYPES,
+    SUNDAY_SHIFT_TYPES,
+    WEEKEND_SHIFT_TYPES,
+    Abteilung,
+    Assignment,
+    Beruf,
+    Schedule,
+    ShiftType,
+    Staff,
+)
+
+# (is_night, is_weekend, is_sunday) per shift type, classified once at import
+_SHIFT_KINDS: dict[ShiftType, tuple[bool, bool, bool]] = {
+    shift_type: (
+        shift_type in NIGHT_SHIFT_TYPES,
+        shift_type in WEEKEND_SHIFT_TYPES,
+        shift_type in SUNDAY_SHIFT_TYPES,
+    )
+    for shift_type in ShiftType
+}
+
+# Sun-Mon and Mon-Tue nights, when a vet (TA) is on site
+_TA_PRESENT_NIGHTS = frozenset({ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE})
 
 
 class ConstraintViolation:
-    """A single constraint violation."""
+    """A single constraint violation.
 
-    def __init__(self, constraint_name: str, description: str, severity: str = "hard") -> None:
+    If format_args are given, description is a str.format template that is only
+    filled in when the description is first read, so callers that just count
+    violations never pay for formatting dates and names.
+    """
+
+    def __init__(
+        self,
+        constraint_name: str,
+        description: str,
+        severity: str = "hard",
+        scope: tuple[str, date] | None = None,
+        format_args: tuple[Any, ...] = (),
+    ) -> None:
         self.constraint_name = constraint_name
-        self.description = description
+        self._description = description
+        self._format_args = format_args
         self.severity = severity  # "hard" or "soft"
+        self.scope = scope  # (staff, date) for per-assignment rules, else None
+
+    @property
+    def description(self) -> str:
+        if self._format_args:
+            self._description = self._description.format(*self._format_args)
+            self._format_args = ()
+        return self._description
 
     def __str__(self) -> str:
         return f"[{self.severity.upper()}] {self.constraint_name}: {self.description}"
 
 
+class _ScheduleIndex:
+    """Assignment groupings shared by all checkers, built in a single pass."""
+
+    def __init__(self, assignments: list[Assignment], staff_dict: dict[str, Staff]) -> None:
+        self.assignments = assignments
+        self.nights: list[Assignment] = []
+        self.weekends: list[Assignment] = []
+        self.sundays: list[Assignment] = []
+        self.by_date: dict[Any, list[Assignment]] = defaultdict(list)
+        self.by_staff_date: dict[tuple[str, Any], list[Assignment]] = defaultdict(list)
+        self.by_staff_night: dict[str, list[Assignment]] = defaultdict(list)
+        self.day_count_by_staff_date: dict[tuple[str, Any], int] = defaultdict(int)
+        self.by_staff_weekend: dict[str, list[Assignment]] = defaultdict(list)
+        self.night_by_shift: dict[tuple[Any, ShiftType], list[Assignment]] = defaultdict(list)
+        self.night_by_date: dict[Any, list[Assignment]] = defaultdict(list)
+        # Known staff on each night, resolved once for all night checks
+        self.night_staff_by_shift: dict[tuple[Any, ShiftType], list[Staff]] = defaultdict(list)
+        self.night_staff_by_date: dict[Any, list[Staff]] = defaultdict(list)
+
+        for assignment in self.assignments:
+            staff_id = assignment.staff_identifier
+            shift = assignment.shift
+            shift_date = shift.shift_date
+            shift_type = shift.shift_type
+            is_night, is_weekend, is_sunday = _SHIFT_KINDS[shift_type]
+
+            self.by_date[shift_date].append(assignment)
+            self.by_staff_date[(staff_id, shift_date)].append(assignment)
+            if is_night:
+                self.nights.append(assignment)
+                self.by_staff_night[staff_id].append(assignment)
+                self.night_by_shift[(shift_date, shift_type)].append(assignment)
+                self.night_by_date[shift_date].append(assignment)
+                staff = staff_dict.get(staff_id)
+                if staff:
+                    self.night_staff_by_shift[(shift_date, shift_type)].append(staff)
+                    self.night_staff_by_date[shift_date].append(staff)
+            else:
+                self.day_count_by_staff_date[(staff_id, shift_date)] += 1
+            if is_weekend:
+                self.weekends.append(assignment)
+                self.by_staff_weekend[staff_id].append(assignment)
+            if is_sunday:
+                self.sundays.append(assignment)
+
+        # Date-ordered per-staff lists, filled from the date buckets (at most
+        # ~91 distinct dates) instead of grouping per assignment and sorting
+        # every staff list. Keys keep first-appearance order so reports do too.
+        self.by_staff: dict[str, list[Assignment]] = {
+            sid: [] for sid in dict.fromkeys(a.staff_identifier for a in assignments)
+        }
+        self.by_staff_night_sorted: dict[str, list[Assignment]] = {
+            sid: [] for sid in self.by_staff_night
+        }
+        for shift_date in sorted(self.by_date):
+            for assignment in self.by_date[shift_date]:
+                self.by_staff[assignment.staff_identifier].append(assignment)
+        for shift_date in sorted(self.night_by_date):
+            for assignment in self.night_by_date[shift_date]:
+                self.by_staff_night_sorted[assignment.staff_identifier].append(assignment)
+
+
 class ValidationResult:
     """Result of schedule validation."""
 
@@ -36,82 +146,195 @@ class ValidationResult:
         return f"Invalid schedule ({len(self.hard_violations)} violations)"
 
 
-def validate_schedule(schedule: Schedule, staff_list: list[Staff]) -> ValidationResult:
+def validate_schedule(
+    schedule: Schedule,
+    staff_list: list[Staff],
+    *,
+    max_hard_violations: int | None = None,
+    hard_only: bool = False,
+) -> ValidationResult:
     """Validate schedule against all constraints.
 
     Returns ValidationResult with hard violations and soft penalty score.
+
+    For search loops that only need a feasibility answer: with max_hard_violations
+    set, checks run cheapest-first and stop once that many hard violations are
+    found (the list is truncated to that length, which must be at least 1); with
+    hard_only=True the soft penalty is only computed for valid schedules and
+    reported as 0.0 otherwise.
     """
+    if max_hard_violations is not None and max_hard_violations < 1:
+        raise ValueError(f"max_hard_violations must be at least 1, got {max_hard_violations}")
+
     violations: list[ConstraintViolation] = []
     staff_dict = {s.identifier: s for s in staff_list}
+    index = _ScheduleIndex(schedule.assignments, staff_dict)
 
     # Check hard constraints
-    violations.extend(_check_minor_sunday_constraint(schedule, staff_dict))
-    violations.extend(_check_intern_weekend_constraint(schedule, staff_dict))
-    violations.extend(_check_night_pairing_constraint(schedule, staff_dict))
-    violations.extend(_check_nd_alone_improper_pairing(schedule, staff_dict))
-    violations.extend(_check_same_day_double_booking(schedule))
-    violations.extend(_check_intern_night_capacity(schedule, staff_dict))
-    violations.extend(_check_same_day_next_day_constraint(schedule))
-    violations.extend(_check_three_week_block_constraint(schedule))
-    violations.extend(_check_weekend_isolation_constraint(schedule))
-    violations.extend(_check_min_consecutive_nights_constraint(schedule, staff_dict))
-    # violations.extend(_check_nd_max_consecutive_constraint(schedule, staff_dict))  # Relaxed to soft
-    violations.extend(_check_nd_exceptions_constraint(schedule, staff_dict))
-    violations.extend(_check_shift_eligibility(schedule, staff_dict))
-    violations.extend(_check_shift_coverage(schedule))
-    violations.extend(_check_abteilung_night_constraint(schedule, staff_dict))
-
-    # Calculate soft penalty
-    soft_penalty = _calculate_soft_penalty(schedule, staff_list)
+    if max_hard_violations is None:
+        for check in _HARD_CHECKS:
+            violations.extend(check(index, staff_dict))
+    else:
+        for check in _HARD_CHECKS_CHEAPEST_FIRST:
+            violations.extend(check(index, staff_dict))
+            if len(violations) >= max_hard_violations:
+                del violations[max_hard_violations:]
+                break
+
+    # Calculate soft penalty (hard_only callers only rank valid schedules)
+    if hard_only and violations:
+        soft_penalty = 0.0
+    else:
+        soft_penalty = _calculate_soft_penalty(schedule, staff_list, index, staff_dict)
 
     return ValidationResult(hard_violations=violations, soft_penalty=soft_penalty)
 
 
+# Recent validate_schedule_cached results, keyed by _validation_cache_key
+# (least recently used first). Streamlit sessions run on separate threads, so
+# access goes through the lock.
+_VALIDATION_CACHE: OrderedDict[tuple[Any, Any], ValidationResult] = OrderedDict()
+_VALIDATION_CACHE_SIZE = 256
+_VALIDATION_CACHE_LOCK = threading.Lock()
+
+
+def validate_schedule_cached(schedule: Schedule, staff_list: list[Staff]) -> ValidationResult:
+    """Memoized validate_schedule for callers that re-validate the same schedules.
+
+    Schedules with the same assignments (in any order) and the same staff share
+    one cached result; each call returns its own copy of the violation list.
+    Violations are reported in the order of the schedule that was validated first.
+    """
+    key = _validation_cache_key(schedule, staff_list)
+    with _VALIDATION_CACHE_LOCK:
+        result = _VALIDATION_CACHE.get(key)
+        if result is not None:
+            _VALIDATION_CACHE.move_to_end(key)
+    if result is None:
+        result = validate_schedule(schedule, staff_list)
+        with _VALIDATION_CACHE_LOCK:
+            _VALIDATION_CACHE[key] = result
+            if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+                _VALIDATION_CACHE.popitem(last=False)
+    return ValidationResult(list(result.hard_violations), result.soft_penalty)
+
+
+def validate_swap(
+    previous: ValidationResult,
+    schedule: Schedule,
+    staff_list: list[Staff],
+    changed_assignments: Iterable[Assignment],
+) -> ValidationResult:
+    """Re-validate a schedule after a local move (e.g. a swap in local search).
+
+    previous must come from validating the schedule before the move against the
+    same staff_list, and changed_assignments must hold every assignment that was
+    added or removed. Per-assignment rules are only re-checked for the touched
+    (staff, date) pairs and their other violations are carried over; all other
+    rules and the soft penalty are recomputed. Violations may be reported in a
+    different order than validate_schedule would use.
+    """
+    staff_dict = {s.identifier: s for s in staff_list}
+    touched = {(a.staff_identifier, a.shift.shift_date) for a in changed_assignments}
+    index = _ScheduleIndex(schedule.assignments, staff_dict)
+    touched_index = _ScheduleIndex(
+        [a for a in schedule.assignments if (a.staff_identifier, a.shift.shift_date) in touched],
+        staff_dict,
+    )
+
+    violations = [
+        v
+        for v in previous.hard_violations
+        if v.constraint_name in _PER_ASSIGNMENT_RULES and v.scope not in touched
+    ]
+    for check in _HARD_CHECKS:
+        if check in _PER_ASSIGNMENT_CHECKS:
+            violations.extend(check(touched_index, staff_dict))
+        else:
+            violations.extend(check(index, staff_dict))
+
+    soft_penalty = _calculate_soft_penalty(schedule, staff_list, index, staff_dict)
+
+    return ValidationResult(hard_violations=violations, soft_penalty=soft_penalty)
+
+
+def _validation_cache_key(schedule: Schedule, staff_list: list[Staff]) -> tuple[Any, Any]:
+    """Order-independent key over the assignments plus every staff field the checks read."""
+    assignments = frozenset(
+        Counter(
+            (a.staff_identifier, a.shift.shift_date, a.shift.shift_type, a.is_paired)
+            for a in schedule.assignments
+        ).items()
+    )
+    staff = tuple(
+        (
+            s.identifier,
+            s.name,
+            s.adult,
+            s.hours,
+            s.beruf,
+            s.abteilung,
+            s.reception,
+            s.nd_possible,
+            s.nd_alone,
+            s.nd_max_consecutive,
+            s.nd_min_consecutive,
+            tuple(s.nd_exceptions),
+        )
+        for s in staff_list
+    )
+    return assignments, staff
+
+
 def _check_minor_sunday_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Minors cannot work Sundays."""
     violations: list[ConstraintViolation] = []
-    for assignment in schedule.assignments:
-        if assignment.shift.shift_type.value.startswith("So_"):
-            staff = staff_dict.get(assignment.staff_identifier)
-            if staff and not staff.adult:
-                violations.append(
-                    ConstraintViolation(
-                        "Minor Sunday Ban",
-                        f"Minor {staff.name} assigned to Sunday shift on "
-                        f"{assignment.shift.shift_date.strftime('%d.%m.%Y')}",
-                    )
-                )
+    minors = {sid: s for sid, s in staff_dict.items() if not s.adult}
+    if not minors:
+        return violations
+    # Select offenders first; messages are only built for the (rare) hits
+    offenders = [a for a in index.sundays if a.staff_identifier in minors]
+    for assignment in offenders:
+        staff = minors[assignment.staff_identifier]
+        violations.append(
+            ConstraintViolation(
+                "Minor Sunday Ban",
+                "Minor {} assigned to Sunday shift on {:%d.%m.%Y}",
+                scope=(assignment.staff_identifier, assignment.shift.shift_date),
+                format_args=(staff.name, assignment.shift.shift_date),
+            )
+        )
     return violations
 
 
-def _check_same_day_double_booking(schedule: Schedule) -> list[ConstraintViolation]:
+def _check_same_day_double_booking(
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
+) -> list[ConstraintViolation]:
     """Check that no person has more than 1 shift on the same day."""
     violations: list[ConstraintViolation] = []
 
-    # Group assignments by (staff, date)
-    assignments_by_staff_date: dict[tuple[str, Any], list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        key = (assignment.staff_identifier, assignment.shift.shift_date)
-        assignments_by_staff_date[key].append(assignment)
-
-    for (staff_id, shift_date), assignments in assignments_by_staff_date.items():
-        if len(assignments) > 1:
-            shift_types = [a.shift.shift_type.value for a in assignments]
-            violations.append(
-                ConstraintViolation(
-                    "Same Day Double Booking",
-                    f"{staff_id} assigned to multiple shifts on "
-                    f"{shift_date.strftime('%d.%m.%Y')}: {', '.join(shift_types)}",
-                )
+    # One group per assignment means nobody is double-booked
+    if len(index.by_staff_date) == len(index.assignments):
+        return violations
+
+    offenders = [item for item in index.by_staff_date.items() if len(item[1]) > 1]
+    for (staff_id, shift_date), assignments in offenders:
+        shift_types = [a.shift.shift_type.value for a in assignments]
+        violations.append(
+            ConstraintViolation(
+                "Same Day Double Booking",
+                "{} assigned to multiple shifts on {:%d.%m.%Y}: {}",
+                format_args=(staff_id, shift_date, ", ".join(shift_types)),
             )
+        )
 
     return violations
 
 
 def _check_nd_alone_improper_pairing(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Staff with nd_alone=True must work ALONE on regular nights (not Sun-Mon, Mon-Tue).
 
@@ -119,18 +342,12 @@ def _check_nd_alone_improper_pairing(
     Sun-Mon and Mon-Tue nights have a vet on-site, so nd_alone doesn't apply there.
     """
     violations: list[ConstraintViolation] = []
-    ta_present_types = {ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE}
-
-    # Group night assignments by (date, shift_type)
-    night_assignments_by_shift: dict[tuple[Any, ShiftType], list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        if assignment.shift.is_night_shift():
-            key = (assignment.shift.shift_date, assignment.shift.shift_type)
-            night_assignments_by_shift[key].append(assignment)
+    if not index.nights:
+        return violations
 
-    for (shift_date, shift_type), assignments in night_assignments_by_shift.items():
+    for (shift_date, shift_type), assignments in index.night_by_shift.items():
         # Skip vet-present nights (nd_alone doesn't apply there)
-        if shift_type in ta_present_types:
+        if shift_type in _TA_PRESENT_NIGHTS:
             continue
 
         if len(assignments) < 2:
@@ -139,13 +356,11 @@ def _check_nd_alone_improper_pairing(
         # Check if any nd_alone=True staff is paired with ANYONE
         nd_alone_true_staff = []
         other_staff = []
-        for a in assignments:
-            staff = staff_dict.get(a.staff_identifier)
-            if staff:
-                if staff.nd_alone:
-                    nd_alone_true_staff.append(staff.name)
-                else:
-                    other_staff.append(staff.name)
+        for staff in index.night_staff_by_shift.get((shift_date, shift_type), ()):
+            if staff.nd_alone:
+                nd_alone_true_staff.append(staff.name)
+            else:
+                other_staff.append(staff.name)
 
         # nd_alone=True staff cannot be paired with anyone on regular nights
         if nd_alone_true_staff and len(assignments) > 1:
@@ -153,16 +368,21 @@ def _check_nd_alone_improper_pairing(
             violations.append(
                 ConstraintViolation(
                     "ND Alone Improper Pairing",
-                    f"Staff with nd_alone=True ({', '.join(nd_alone_true_staff)}) cannot be "
-                    f"paired with anyone on regular nights. Found with: {', '.join(all_others)} on "
-                    f"{shift_date.strftime('%d.%m.%Y')} {shift_type.value}",
+                    "Staff with nd_alone=True ({}) cannot be paired with anyone on regular "
+                    "nights. Found with: {} on {:%d.%m.%Y} {}",
+                    format_args=(
+                        ", ".join(nd_alone_true_staff),
+                        ", ".join(all_others),
+                        shift_date,
+                        shift_type.value,
+                    ),
                 )
             )
 
     return violations
 
 
-def _check_intern_night_capacity(schedule: Schedule, staff_dict: dict[str, Staff]) -> list[ConstraintViolation]:
+def _check_intern_night_capacity(index: _ScheduleIndex, staff_dict: dict[str, Staff]) -> list[ConstraintViolation]:
     """Sun-Mon and Mon-Tue nights: exactly 1 non-Azubi + optional 0-1 Azubi.
     
     These nights have a vet on-site externally, so:
@@ -172,45 +392,38 @@ def _check_intern_night_capacity(schedule: Schedule, staff_dict: dict[str, Staff
     - Two non-Azubis cannot work together on these nights
     """
     violations: list[ConstraintViolation] = []
-    vet_present_types = {ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE}
-
-    # Group assignments by (date, shift_type)
-    night_assignments_by_shift: dict[tuple[Any, ShiftType], list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        if assignment.shift.is_night_shift():
-            key = (assignment.shift.shift_date, assignment.shift.shift_type)
-            night_assignments_by_shift[key].append(assignment)
+    if not index.nights:
+        return violations
 
-    for (shift_date, shift_type), assignments in night_assignments_by_shift.items():
-        if shift_type not in vet_present_types:
+    for shift_date, shift_type in index.night_by_shift:
+        if shift_type not in _TA_PRESENT_NIGHTS:
             continue
         
         # Categorize staff
         non_azubis = []
         azubis = []
-        for a in assignments:
-            staff = staff_dict.get(a.staff_identifier)
-            if staff:
-                if staff.beruf == Beruf.AZUBI:
-                    azubis.append(staff.name)
-                else:
-                    non_azubis.append(staff.name)
+        for staff in index.night_staff_by_shift.get((shift_date, shift_type), ()):
+            if staff.beruf == Beruf.AZUBI:
+                azubis.append(staff.name)
+            else:
+                non_azubis.append(staff.name)
         
         # Must have exactly 1 non-Azubi
         if len(non_azubis) == 0:
             violations.append(
                 ConstraintViolation(
                     "Intern Night No Non-Azubi",
-                    f"Sun-Mon/Mon-Tue night on {shift_date.strftime('%d.%m.%Y')} has "
-                    f"only Azubis ({', '.join(azubis)}), needs exactly 1 TFA or Intern",
+                    "Sun-Mon/Mon-Tue night on {:%d.%m.%Y} has only Azubis ({}), "
+                    "needs exactly 1 TFA or Intern",
+                    format_args=(shift_date, ", ".join(azubis)),
                 )
             )
         elif len(non_azubis) > 1:
             violations.append(
                 ConstraintViolation(
                     "Vet Night Over Capacity",
-                    f"Sun-Mon/Mon-Tue night on {shift_date.strftime('%d.%m.%Y')} has "
-                    f"{len(non_azubis)} non-Azubis ({', '.join(non_azubis)}), max is 1",
+                    "Sun-Mon/Mon-Tue night on {:%d.%m.%Y} has {} non-Azubis ({}), max is 1",
+                    format_args=(shift_date, len(non_azubis), ", ".join(non_azubis)),
                 )
             )
         
@@ -219,8 +432,8 @@ def _check_intern_night_capacity(schedule: Schedule, staff_dict: dict[str, Staff
             violations.append(
                 ConstraintViolation(
                     "Multiple Azubis on Night",
-                    f"Night on {shift_date.strftime('%d.%m.%Y')} has multiple Azubis "
-                    f"({', '.join(azubis)}), only 1 Azubi allowed per night",
+                    "Night on {:%d.%m.%Y} has multiple Azubis ({}), only 1 Azubi allowed per night",
+                    format_args=(shift_date, ", ".join(azubis)),
                 )
             )
 
@@ -228,26 +441,29 @@ def _check_intern_night_capacity(schedule: Schedule, staff_dict: dict[str, Staff
 
 
 def _check_intern_weekend_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Interns never work weekends."""
     violations: list[ConstraintViolation] = []
-    for assignment in schedule.assignments:
-        if assignment.shift.is_weekend_shift():
-            staff = staff_dict.get(assignment.staff_identifier)
-            if staff and staff.beruf == Beruf.INTERN:
-                violations.append(
-                    ConstraintViolation(
-                        "Intern Weekend Ban",
-                        f"Intern {staff.name} assigned to weekend shift on "
-                        f"{assignment.shift.shift_date.strftime('%d.%m.%Y')}",
-                    )
-                )
+    interns = {sid: s for sid, s in staff_dict.items() if s.beruf == Beruf.INTERN}
+    if not interns:
+        return violations
+    offenders = [a for a in index.weekends if a.staff_identifier in interns]
+    for assignment in offenders:
+        staff = interns[assignment.staff_identifier]
+        violations.append(
+            ConstraintViolation(
+                "Intern Weekend Ban",
+                "Intern {} assigned to weekend shift on {:%d.%m.%Y}",
+                scope=(assignment.staff_identifier, assignment.shift.shift_date),
+                format_args=(staff.name, assignment.shift.shift_date),
+            )
+        )
     return violations
 
 
 def _check_night_pairing_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Check night pairing rules:
     - Azubis must always be paired with a non-Azubi (TFA or Intern)
@@ -255,16 +471,10 @@ def _check_night_pairing_constraint(
     - nd_alone=False staff must be paired (except Sun-Mon, Mon-Tue with Intern present)
     """
     violations: list[ConstraintViolation] = []
-    intern_present_types = {ShiftType.NIGHT_SUN_MON, ShiftType.NIGHT_MON_TUE}
+    if not index.nights:
+        return violations
 
-    # Group night assignments by (date, shift_type)
-    night_assignments_by_shift: dict[tuple[Any, ShiftType], list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        if assignment.shift.is_night_shift():
-            key = (assignment.shift.shift_date, assignment.shift.shift_type)
-            night_assignments_by_shift[key].append(assignment)
-
-    for (shift_date, shift_type), assignments in night_assignments_by_shift.items():
+    for (shift_date, shift_type), assignments in index.night_by_shift.items():
         if not assignments:
             continue
 
@@ -273,10 +483,7 @@ def _check_night_pairing_constraint(
         non_azubis = []
         nd_alone_false_staff = []
         
-        for assignment in assignments:
-            staff = staff_dict.get(assignment.staff_identifier)
-            if not staff:
-                continue
+        for staff in index.night_staff_by_shift.get((shift_date, shift_type), ()):
             if staff.beruf == Beruf.AZUBI:
                 azubis.append(staff)
             else:
@@ -290,8 +497,8 @@ def _check_night_pairing_constraint(
             violations.append(
                 ConstraintViolation(
                     "Multiple Azubis on Night",
-                    f"Night on {shift_date.strftime('%d.%m.%Y')} {shift_type.value} has "
-                    f"multiple Azubis ({', '.join(azubi_names)}), only 1 Azubi allowed",
+                    "Night on {:%d.%m.%Y} {} has multiple Azubis ({}), only 1 Azubi allowed",
+                    format_args=(shift_date, shift_type.value, ", ".join(azubi_names)),
                 )
             )
 
@@ -301,13 +508,13 @@ def _check_night_pairing_constraint(
                 violations.append(
                     ConstraintViolation(
                         "Azubi Night Pairing",
-                        f"Azubi {azubi.name} working night alone on "
-                        f"{shift_date.strftime('%d.%m.%Y')} (no TFA/Intern present)",
+                        "Azubi {} working night alone on {:%d.%m.%Y} (no TFA/Intern present)",
+                        format_args=(azubi.name, shift_date),
                     )
                 )
 
         # Rule: nd_alone=False must be paired (except intern-present nights)
-        is_intern_present = shift_type in intern_present_types
+        is_intern_present = shift_type in _TA_PRESENT_NIGHTS
         for staff in nd_alone_false_staff:
             # Skip Azubis (handled above)
             if staff.beruf == Beruf.AZUBI:
@@ -317,48 +524,51 @@ def _check_night_pairing_constraint(
                 violations.append(
                     ConstraintViolation(
                         "Night Pairing Required",
-                        f"{staff.name} (nd_alone=False) working night alone on "
-                        f"{shift_date.strftime('%d.%m.%Y')}",
+                        "{} (nd_alone=False) working night alone on {:%d.%m.%Y}",
+                        format_args=(staff.name, shift_date),
                     )
                 )
 
     return violations
 
 
-def _check_same_day_next_day_constraint(schedule: Schedule) -> list[ConstraintViolation]:
+def _check_same_day_next_day_constraint(
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
+) -> list[ConstraintViolation]:
     """Staff with night shift cannot have day shift same day or next day."""
     violations: list[ConstraintViolation] = []
 
-    # Group all assignments by staff
-    staff_assignments: dict[str, list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        staff_assignments[assignment.staff_identifier].append(assignment)
+    day_counts = index.day_count_by_staff_date
+    if not day_counts:
+        return violations
 
-    for staff_id, assignments in staff_assignments.items():
-        # Get night shifts
-        night_shifts = [a for a in assignments if a.shift.is_night_shift()]
+    for staff_id in index.by_staff:
+        night_shifts = index.by_staff_night.get(staff_id)
+        if not night_shifts:
+            continue
 
         for night_assignment in night_shifts:
             night_date = night_assignment.shift.shift_date
             next_date = night_assignment.shift.get_next_day()
 
             # Check for day shifts on same day or next day
-            for assignment in assignments:
-                if not assignment.shift.is_night_shift():
-                    shift_date = assignment.shift.shift_date
-                    if shift_date == night_date or shift_date == next_date:
-                        violations.append(
-                            ConstraintViolation(
-                                "Night/Day Conflict",
-                                f"{staff_id} has day shift on {shift_date.strftime('%d.%m.%Y')} "
-                                f"conflicting with night shift on {night_date.strftime('%d.%m.%Y')}",
-                            )
+            for shift_date in (night_date, next_date):
+                for _ in range(day_counts.get((staff_id, shift_date), 0)):
+                    violations.append(
+                        ConstraintViolation(
+                            "Night/Day Conflict",
+                            "{} has day shift on {:%d.%m.%Y} "
+                            "conflicting with night shift on {:%d.%m.%Y}",
+                            format_args=(staff_id, shift_date, night_date),
                         )
+                    )
 
     return violations
 
 
-def _check_three_week_block_constraint(schedule: Schedule) -> list[ConstraintViolation]:
+def _check_three_week_block_constraint(
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
+) -> list[ConstraintViolation]:
     """Each staff can have max 1 consecutive block per rolling 3-week window.
     
     Blocks must be separated by at least 21 days (from start to start).
@@ -367,42 +577,34 @@ def _check_three_week_block_constraint(schedule: Schedule) -> list[ConstraintVio
     """
     violations: list[ConstraintViolation] = []
 
-    # Group assignments by staff
-    staff_assignments: dict[str, list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        staff_assignments[assignment.staff_identifier].append(assignment)
-
-    for staff_id, assignments in staff_assignments.items():
-        # Sort by date
-        sorted_assignments = sorted(assignments, key=lambda a: a.shift.shift_date)
-
+    for staff_id, sorted_assignments in index.by_staff.items():
         # Find consecutive blocks
         blocks = _find_consecutive_blocks(sorted_assignments)
 
-        # Check rolling 2-week windows
-        for i, block1 in enumerate(blocks):
+        # Block starts are strictly increasing, so only the next block can
+        # start within 3 weeks (21 days) of this one: if it doesn't, no
+        # later block does either.
+        for block1, block2 in pairwise(blocks):
             block1_start = block1[0].shift.shift_date
-            block1_end = block1[-1].shift.shift_date
-
-            for block2 in blocks[i + 1 :]:
-                block2_start = block2[0].shift.shift_date
+            block2_start = block2[0].shift.shift_date
 
-                # Check if block2 starts within 3 weeks (21 days) of block1 start
-                if (block2_start - block1_start).days < 21:
-                    violations.append(
-                        ConstraintViolation(
-                            "3-Week Block Limit",
-                            f"{staff_id} has multiple shift blocks within 3 weeks: "
-                            f"{block1_start.strftime('%d.%m.%Y')}-{block1_end.strftime('%d.%m.%Y')} "
-                            f"and {block2_start.strftime('%d.%m.%Y')}",
-                        )
+            if block2_start.toordinal() - block1_start.toordinal() < 21:
+                block1_end = block1[-1].shift.shift_date
+                violations.append(
+                    ConstraintViolation(
+                        "3-Week Block Limit",
+                        "{} has multiple shift blocks within 3 weeks: "
+                        "{:%d.%m.%Y}-{:%d.%m.%Y} and {:%d.%m.%Y}",
+                        format_args=(staff_id, block1_start, block1_end, block2_start),
                     )
-                    break  # Only report first violation per block
+                )
 
     return violations
 
 
-def _check_weekend_isolation_constraint(schedule: Schedule) -> list[ConstraintViolation]:
+def _check_weekend_isolation_constraint(
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
+) -> list[ConstraintViolation]:
     """Weekend shifts must always be isolated (single-shift, not part of a block).
     
     A weekend shift cannot be adjacent (same day or next day) to any other shift
@@ -410,35 +612,37 @@ def _check_weekend_isolation_constraint(schedule: Schedule) -> list[ConstraintVi
     """
     violations: list[ConstraintViolation] = []
 
-    # Group assignments by staff
-    staff_assignments: dict[str, list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        staff_assignments[assignment.staff_identifier].append(assignment)
-
-    for staff_id, assignments in staff_assignments.items():
-        # Get weekend shifts and all dates worked
-        weekend_assignments = [a for a in assignments if a.shift.is_weekend_shift()]
-        all_dates_worked = {a.shift.shift_date for a in assignments}
+    for staff_id, assignments in index.by_staff.items():
+        weekend_assignments = index.by_staff_weekend.get(staff_id)
+        if not weekend_assignments:
+            continue
+        # Day ordinals, so neighbouring days are plain int offsets
+        ordinals_worked = {a.shift.shift_date.toordinal() for a in assignments}
 
         for we_assignment in weekend_assignments:
             we_date = we_assignment.shift.shift_date
-            prev_date = we_date - timedelta(days=1)
-            next_date = we_date + timedelta(days=1)
+            we_ordinal = we_date.toordinal()
 
             # Check if adjacent to another shift (forming a block)
-            adjacent_worked = []
-            if prev_date in all_dates_worked:
-                adjacent_worked.append(prev_date.strftime('%d.%m.%Y'))
-            if next_date in all_dates_worked:
-                adjacent_worked.append(next_date.strftime('%d.%m.%Y'))
+            adjacent_ordinals = [
+                o for o in (we_ordinal - 1, we_ordinal + 1) if o in ordinals_worked
+            ]
 
-            if adjacent_worked:
+            if adjacent_ordinals:
+                adjacent_worked = [date.fromordinal(o) for o in adjacent_ordinals]
+                adjacent_fields = ", ".join(["{:%d.%m.%Y}"] * len(adjacent_worked))
                 violations.append(
                     ConstraintViolation(
                         "Weekend Isolation",
-                        f"{staff_id}'s weekend shift on {we_date.strftime('%d.%m.%Y')} "
-                        f"({we_assignment.shift.shift_type.value}) is adjacent to shifts on "
-                        f"{', '.join(adjacent_worked)}. Weekend shifts must be isolated.",
+                        "{}'s weekend shift on {:%d.%m.%Y} ({}) is adjacent to shifts on "
+                        + adjacent_fields
+                        + ". Weekend shifts must be isolated.",
+                        format_args=(
+                            staff_id,
+                            we_date,
+                            we_assignment.shift.shift_type.value,
+                            *adjacent_worked,
+                        ),
                     )
                 )
 
@@ -447,48 +651,40 @@ def _check_weekend_isolation_constraint(schedule: Schedule) -> list[ConstraintVi
 
 def _find_consecutive_blocks(sorted_assignments: list[Assignment]) -> list[list[Assignment]]:
     """Find consecutive blocks of shifts (gaps > 1 day break blocks)."""
-    if not sorted_assignments:
-        return []
-
     blocks: list[list[Assignment]] = []
-    current_block = [sorted_assignments[0]]
+    current_block: list[Assignment] = []
+    prev_ordinal = 0
 
-    for i in range(1, len(sorted_assignments)):
-        prev_date = sorted_assignments[i - 1].shift.shift_date
-        curr_date = sorted_assignments[i].shift.shift_date
+    for assignment in sorted_assignments:
+        # Day ordinals: the gap is an int subtraction, no timedelta per pair
+        ordinal = assignment.shift.shift_date.toordinal()
 
-        # If gap is <= 1 day, continue current block
-        if (curr_date - prev_date).days <= 1:
-            current_block.append(sorted_assignments[i])
-        else:
-            # Start new block
-            if len(current_block) >= 1:
-                blocks.append(current_block)
-            current_block = [sorted_assignments[i]]
+        # A gap of more than 1 day starts a new block
+        if current_block and ordinal - prev_ordinal > 1:
+            blocks.append(current_block)
+            current_block = []
+        current_block.append(assignment)
+        prev_ordinal = ordinal
 
     # Add final block
-    if len(current_block) >= 1:
+    if current_block:
         blocks.append(current_block)
 
     return blocks
 
 
 def _check_min_consecutive_nights_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Staff must work at least nd_min_consecutive consecutive nights per block.
 
     Skips staff where nd_min_consecutive <= 1 (e.g. Azubis or special TFA cases).
     """
     violations: list[ConstraintViolation] = []
+    if not index.nights:
+        return violations
 
-    # Group night assignments by staff
-    staff_night_assignments: dict[str, list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        if assignment.shift.is_night_shift():
-            staff_night_assignments[assignment.staff_identifier].append(assignment)
-
-    for staff_id, night_assignments in staff_night_assignments.items():
+    for staff_id, sorted_nights in index.by_staff_night_sorted.items():
         staff = staff_dict.get(staff_id)
         if not staff:
             continue
@@ -497,9 +693,6 @@ def _check_min_consecutive_nights_constraint(
         if min_consecutive <= 1:
             continue  # Single nights allowed — no constraint to enforce
 
-        # Sort by date
-        sorted_nights = sorted(night_assignments, key=lambda a: a.shift.shift_date)
-
         # Find consecutive night blocks
         consecutive_blocks = _find_consecutive_blocks(sorted_nights)
 
@@ -509,158 +702,193 @@ def _check_min_consecutive_nights_constraint(
                 violations.append(
                     ConstraintViolation(
                         "Min Consecutive Nights",
-                        f"{staff.name} ({staff.beruf.value}) working only {block_length} "
-                        f"consecutive night(s) starting "
-                        f"{block[0].shift.shift_date.strftime('%d.%m.%Y')}, "
-                        f"minimum is {min_consecutive} (nd_min_consecutive)",
+                        "{} ({}) working only {} consecutive night(s) starting {:%d.%m.%Y}, "
+                        "minimum is {} (nd_min_consecutive)",
+                        format_args=(
+                            staff.name,
+                            staff.beruf.value,
+                            block_length,
+                            block[0].shift.shift_date,
+                            min_consecutive,
+                        ),
                     )
                 )
 
     return violations
 
 
-def _check_nd_max_consecutive_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
-) -> list[ConstraintViolation]:
-    """Check that consecutive night counts don't exceed staff nd_max_consecutive."""
-    violations: list[ConstraintViolation] = []
-
-    # Group night assignments by staff
-    staff_night_assignments: dict[str, list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        if assignment.shift.is_night_shift():
-            staff_night_assignments[assignment.staff_identifier].append(assignment)
-
-    for staff_id, night_assignments in staff_night_assignments.items():
+def _iter_nd_max_consecutive_blocks(
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
+) -> Iterator[tuple[Staff, list[Assignment]]]:
+    """Yield (staff, block) for night blocks longer than the staff's nd_max_consecutive."""
+    for staff_id, sorted_nights in index.by_staff_night_sorted.items():
         staff = staff_dict.get(staff_id)
         if not staff or staff.nd_max_consecutive is None:
             continue
 
-        # Sort by date
-        sorted_nights = sorted(night_assignments, key=lambda a: a.shift.shift_date)
-
         # Find consecutive night blocks
-        consecutive_blocks = _find_consecutive_blocks(sorted_nights)
-
-        for block in consecutive_blocks:
-            block_length = len(block)
-            if block_length > staff.nd_max_consecutive:
-                violations.append(
-                    ConstraintViolation(
-                        "ND Max Consecutive",
-                        f"{staff.name} working {block_length} consecutive nights starting "
-                        f"{block[0].shift.shift_date.strftime('%d.%m.%Y')}, "
-                        f"max is {staff.nd_max_consecutive}",
-                    )
-                )
-
-    return violations
+        for block in _find_consecutive_blocks(sorted_nights):
+            if len(block) > staff.nd_max_consecutive:
+                yield staff, block
 
 
-def _check_nd_count_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+def _check_nd_max_consecutive_constraint(
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
-    """DEPRECATED: Check that consecutive night counts match staff nd_count field.
-    
-    This is kept for backwards compatibility but now uses nd_max_consecutive.
-    """
-    # Delegate to the new function
-    return _check_nd_max_consecutive_constraint(schedule, staff_dict)
-
-    return violations
+    """Check that consecutive night counts don't exceed staff nd_max_consecutive."""
+    return [
+        ConstraintViolation(
+            "ND Max Consecutive",
+            "{} working {} consecutive nights starting {:%d.%m.%Y}, max is {}",
+            format_args=(
+                staff.name,
+                len(block),
+                block[0].shift.shift_date,
+                staff.nd_max_consecutive,
+            ),
+        )
+        for staff, block in _iter_nd_max_consecutive_blocks(index, staff_dict)
+    ]
 
 
 def _check_nd_exceptions_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Check that night shifts respect nd_exceptions weekdays."""
     violations: list[ConstraintViolation] = []
+    # Excluded weekdays as a 7-bit mask per staff (bit n = isoweekday n)
+    restricted = {
+        sid: (s, sum(1 << w for w in set(s.nd_exceptions) if 1 <= w <= 7))
+        for sid, s in staff_dict.items()
+        if s.nd_exceptions
+    }
+    if not restricted:
+        return violations
+
+    for assignment in index.nights:
+        entry = restricted.get(assignment.staff_identifier)
+        if not entry:
+            continue
 
-    for assignment in schedule.assignments:
-        if assignment.shift.is_night_shift():
-            staff = staff_dict.get(assignment.staff_identifier)
-            if not staff:
-                continue
-
-            weekday = assignment.shift.shift_date.isoweekday()  # 1=Mon, 7=Sun
-            if weekday in staff.nd_exceptions:
-                violations.append(
-                    ConstraintViolation(
-                        "ND Exception Weekday",
-                        f"{staff.name} assigned night shift on "
-                        f"{assignment.shift.shift_date.strftime('%d.%m.%Y')} "
-                        f"(weekday {weekday} in exceptions)",
-                    )
+        staff, excluded_mask = entry
+        weekday = assignment.shift.shift_date.isoweekday()  # 1=Mon, 7=Sun
+        if excluded_mask >> weekday & 1:
+            violations.append(
+                ConstraintViolation(
+                    "ND Exception Weekday",
+                    "{} assigned night shift on {:%d.%m.%Y} (weekday {} in exceptions)",
+                    scope=(assignment.staff_identifier, assignment.shift.shift_date),
+                    format_args=(staff.name, assignment.shift.shift_date, weekday),
                 )
+            )
 
     return violations
 
 
+# Eligible (shift type, ISO weekday) pairs per staff eligibility profile
+_ELIGIBILITY_TABLES: dict[tuple[Any, ...], frozenset[tuple[ShiftType, int]]] = {}
+
+
+def _eligibility_table(staff: Staff) -> frozenset[tuple[ShiftType, int]]:
+    """(shift type, ISO weekday) pairs the staff member may work.
+
+    can_work_shift only looks at the date's weekday, so it is evaluated once per
+    shift type and weekday for each combination of the staff fields it reads,
+    and the table is reused across validations.
+    """
+    key = (
+        staff.adult,
+        staff.beruf,
+        staff.reception,
+        staff.nd_possible,
+        frozenset(staff.nd_exceptions),
+    )
+    table = _ELIGIBILITY_TABLES.get(key)
+    if table is None:
+        # 1-7 Jan 2024 run Monday to Sunday
+        week = [date(2024, 1, day) for day in range(1, 8)]
+        table = frozenset(
+            (shift_type, day.isoweekday())
+            for shift_type in ShiftType
+            for day in week
+            if staff.can_work_shift(shift_type, day)
+        )
+        _ELIGIBILITY_TABLES[key] = table
+    return table
+
+
 def _check_shift_eligibility(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Check that staff are eligible for their assigned shifts."""
     violations: list[ConstraintViolation] = []
+    tables: dict[str, frozenset[tuple[ShiftType, int]]] = {}
 
-    for assignment in schedule.assignments:
-        staff = staff_dict.get(assignment.staff_identifier)
+    for assignment in index.assignments:
+        staff_id = assignment.staff_identifier
+        staff = staff_dict.get(staff_id)
         if not staff:
             violations.append(
                 ConstraintViolation(
                     "Unknown Staff",
-                    f"Staff {assignment.staff_identifier} not found in staff list",
+                    "Staff {} not found in staff list",
+                    format_args=(assignment.staff_identifier,),
                 )
             )
             continue
 
-        if not staff.can_work_shift(assignment.shift.shift_type, assignment.shift.shift_date):
+        table = tables.get(staff_id)
+        if table is None:
+            table = tables[staff_id] = _eligibility_table(staff)
+
+        shift = assignment.shift
+        if (shift.shift_type, shift.shift_date.isoweekday()) not in table:
             violations.append(
                 ConstraintViolation(
                     "Shift Eligibility",
-                    f"{staff.name} not eligible for {assignment.shift.shift_type.value} on "
-                    f"{assignment.shift.shift_date.strftime('%d.%m.%Y')}",
+                    "{} not eligible for {} on {:%d.%m.%Y}",
+                    format_args=(
+                        staff.name,
+                        assignment.shift.shift_type.value,
+                        assignment.shift.shift_date,
+                    ),
                 )
             )
 
     return violations
 
 
-def _check_shift_coverage(schedule: Schedule) -> list[ConstraintViolation]:
+def _check_shift_coverage(
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
+) -> list[ConstraintViolation]:
     """Check that all required shifts are covered."""
     violations: list[ConstraintViolation] = []
 
-    # Group assignments by shift
-    shift_coverage: dict[tuple[Any, Any], int] = defaultdict(int)
-    for assignment in schedule.assignments:
-        key = (assignment.shift.shift_date, assignment.shift.shift_type)
-        shift_coverage[key] += 1
-
-    # Check night shifts (require 1-2 staff)
-    for key, count in shift_coverage.items():
-        shift_date, shift_type = key
-        if shift_type.value.startswith("N_"):
-            if count == 0:
-                violations.append(
-                    ConstraintViolation(
-                        "Shift Coverage",
-                        f"Night shift {shift_type.value} on {shift_date.strftime('%d.%m.%Y')} "
-                        "has no coverage",
-                    )
+    # Check night shifts (require 1-2 staff); only nights are grouped
+    for (shift_date, shift_type), night_assignments in index.night_by_shift.items():
+        count = len(night_assignments)
+        if count == 0:
+            violations.append(
+                ConstraintViolation(
+                    "Shift Coverage",
+                    "Night shift {} on {:%d.%m.%Y} has no coverage",
+                    format_args=(shift_type.value, shift_date),
                 )
-            elif count > 2:
-                violations.append(
-                    ConstraintViolation(
-                        "Shift Overstaffing",
-                        f"Night shift {shift_type.value} on {shift_date.strftime('%d.%m.%Y')} "
-                        f"has {count} staff (max 2)",
-                    )
+            )
+        elif count > 2:
+            violations.append(
+                ConstraintViolation(
+                    "Shift Overstaffing",
+                    "Night shift {} on {:%d.%m.%Y} has {} staff (max 2)",
+                    format_args=(shift_type.value, shift_date, count),
                 )
+            )
 
     return violations
 
 
 def _check_abteilung_night_constraint(
-    schedule: Schedule, staff_dict: dict[str, Staff]
+    index: _ScheduleIndex, staff_dict: dict[str, Staff]
 ) -> list[ConstraintViolation]:
     """Check abteilung separation on night shifts.
     
@@ -671,72 +899,145 @@ def _check_abteilung_night_constraint(
     Employees in abteilung="other" are exempt.
     """
     violations: list[ConstraintViolation] = []
+    if not index.nights:
+        return violations
     restricted_abteilungen = {Abteilung.OP, Abteilung.STATION}
     
-    # Group night assignments by date
-    night_assignments_by_date: dict[Any, list[Assignment]] = defaultdict(list)
-    for assignment in schedule.assignments:
-        if assignment.shift.is_night_shift():
-            night_assignments_by_date[assignment.shift.shift_date].append(assignment)
-    
-    sorted_dates = sorted(night_assignments_by_date.keys())
-    
+    sorted_dates = sorted(index.night_by_date.keys())
+
+    # Restricted staff per abteilung for each night, built once per date so the
+    # consecutive-day comparison can reuse the next night's mapping
+    restricted_by_date: list[dict[Abteilung, list[str]]] = []
+    for shift_date in sorted_dates:
+        restricted_staff: dict[Abteilung, list[str]] = defaultdict(list)
+        for staff in index.night_staff_by_date.get(shift_date, ()):
+            if staff.abteilung in restricted_abteilungen:
+                restricted_staff[staff.abteilung].append(staff.name)
+        restricted_by_date.append(restricted_staff)
+    restricted_sets_by_date = [
+        {abteilung: set(names) for abteilung, names in restricted_staff.items()}
+        for restricted_staff in restricted_by_date
+    ]
+
     for i, shift_date in enumerate(sorted_dates):
-        assignments = night_assignments_by_date[shift_date]
-        
-        # Get staff with restricted abteilung for this night
-        restricted_staff_today: dict[Abteilung, list[str]] = defaultdict(list)
-        for a in assignments:
-            staff = staff_dict.get(a.staff_identifier)
-            if staff and staff.abteilung in restricted_abteilungen:
-                restricted_staff_today[staff.abteilung].append(staff.name)
-        
         # 1. Check same night: no two staff from same abteilung
-        for abteilung, names in restricted_staff_today.items():
+        for abteilung, names in restricted_by_date[i].items():
             if len(names) >= 2:
                 violations.append(
                     ConstraintViolation(
                         "Abteilung Same Night",
-                        f"Multiple {abteilung.value} staff ({', '.join(names)}) "
-                        f"assigned to same night on {shift_date.strftime('%d.%m.%Y')}",
+                        "Multiple {} staff ({}) assigned to same night on {:%d.%m.%Y}",
+                        format_args=(abteilung.value, ", ".join(names), shift_date),
                     )
                 )
-        
+
         # 2. Check consecutive days: no two staff from same abteilung on consecutive days
         if i < len(sorted_dates) - 1:
             next_date = sorted_dates[i + 1]
             # Only check if dates are actually consecutive
-            if (next_date - shift_date).days == 1:
-                next_assignments = night_assignments_by_date[next_date]
-                
-                restricted_staff_tomorrow: dict[Abteilung, list[str]] = defaultdict(list)
-                for a in next_assignments:
-                    staff = staff_dict.get(a.staff_identifier)
-                    if staff and staff.abteilung in restricted_abteilungen:
-                        restricted_staff_tomorrow[staff.abteilung].append(staff.name)
-                
+            if next_date.toordinal() - shift_date.toordinal() == 1:
+                today_sets = restricted_sets_by_date[i]
+                tomorrow_sets = restricted_sets_by_date[i + 1]
+
                 # Check for same abteilung on consecutive days (different people)
                 for abteilung in restricted_abteilungen:
-                    today_names = set(restricted_staff_today.get(abteilung, []))
-                    tomorrow_names = set(restricted_staff_tomorrow.get(abteilung, []))
-                    
+                    today_names = today_sets.get(abteilung)
+                    tomorrow_names = tomorrow_sets.get(abteilung)
+
                     # Find different people from same abteilung on consecutive days
                     # (same person on consecutive days is allowed and handled elsewhere)
-                    different_people = today_names.symmetric_difference(tomorrow_names)
-                    if today_names and tomorrow_names and different_people:
+                    if today_names and tomorrow_names and today_names ^ tomorrow_names:
                         violations.append(
                             ConstraintViolation(
                                 "Abteilung Consecutive Days",
-                                f"Staff from {abteilung.value} on consecutive nights: "
-                                f"{', '.join(today_names)} on {shift_date.strftime('%d.%m.%Y')} "
-                                f"and {', '.join(tomorrow_names)} on {next_date.strftime('%d.%m.%Y')}",
+                                "Staff from {} on consecutive nights: "
+                                "{} on {:%d.%m.%Y} and {} on {:%d.%m.%Y}",
+                                format_args=(
+                                    abteilung.value,
+                                    ", ".join(today_names),
+                                    shift_date,
+                                    ", ".join(tomorrow_names),
+                                    next_date,
+                                ),
                             )
                         )
-    
+
     return violations
 
 
-def _calculate_soft_penalty(schedule: Schedule, staff_list: list[Staff]) -> float:
+_Check = Callable[[_ScheduleIndex, dict[str, Staff]], list[ConstraintViolation]]
+
+# Hard constraint checks in reporting order
+_HARD_CHECKS: tuple[_Check, ...] = (
+    _check_minor_sunday_constraint,
+    _check_intern_weekend_constraint,
+    _check_night_pairing_constraint,
+    _check_nd_alone_improper_pairing,
+    _check_same_day_double_booking,
+    _check_intern_night_capacity,
+    _check_same_day_next_day_constraint,
+    _check_three_week_block_constraint,
+    _check_weekend_isolation_constraint,
+    _check_min_consecutive_nights_constraint,
+    # _check_nd_max_consecutive_constraint,  # Relaxed to soft
+    _check_nd_exceptions_constraint,
+    _check_shift_eligibility,
+    _check_shift_coverage,
+    _check_abteilung_night_constraint,
+)
+
+# Same checks for early-exit validation: cheap, frequently violated checks first
+_HARD_CHECKS_CHEAPEST_FIRST: tuple[_Check, ...] = (
+    _check_same_day_double_booking,
+    _check_shift_eligibility,
+    _check_minor_sunday_constraint,
+    _check_intern_weekend_constraint,
+    _check_nd_exceptions_constraint,
+    _check_shift_coverage,
+    _check_same_day_next_day_constraint,
+    _check_weekend_isolation_constraint,
+    _check_night_pairing_constraint,
+    _check_nd_alone_improper_pairing,
+    _check_intern_night_capacity,
+    _check_min_consecutive_nights_constraint,
+    _check_three_week_block_constraint,
+    _check_abteilung_night_constraint,
+)
+
+# Checks whose violations depend on a single assignment; each sets a (staff, date) scope
+_PER_ASSIGNMENT_CHECKS: frozenset[_Check] = frozenset(
+    {
+        _check_minor_sunday_constraint,
+        _check_intern_weekend_constraint,
+        _check_nd_exceptions_constraint,
+    }
+)
+_PER_ASSIGNMENT_RULES = frozenset({"Minor Sunday Ban", "Intern Weekend Ban", "ND Exception Weekday"})
+
+
+def _tally_notdienst(index: _ScheduleIndex, staff_list: list[Staff]) -> list[float]:
+    """Total Notdienst (weekends + effective nights) per staff member, aligned with staff_list.
+
+    Same result as Schedule.count_total_notdienst, but reads the per-staff
+    lists of the index instead of scanning all assignments for every staff member.
+    """
+    counts: list[float] = []
+    for staff in staff_list:
+        weekend_count = len(index.by_staff_weekend.get(staff.identifier, ()))
+        effective_nights = sum(
+            staff.effective_nights_weight(a.is_paired)
+            for a in index.by_staff_night.get(staff.identifier, ())
+        )
+        counts.append(weekend_count + effective_nights)
+    return counts
+
+
+def _calculate_soft_penalty(
+    schedule: Schedule,
+    staff_list: list[Staff],
+    index: _ScheduleIndex,
+    staff_dict: dict[str, Staff],
+) -> float:
     """Calculate soft constraint penalty score.
 
     Lower is better. Penalizes:
@@ -744,41 +1045,38 @@ def _calculate_soft_penalty(schedule: Schedule, staff_list: list[Staff]) -> floa
     - Unfairness within role groups (std deviation)
     """
     penalty = 0.0
-    staff_dict = {s.identifier: s for s in staff_list}
 
     # Calculate target Notdienst per staff based on hours
     total_hours = sum(s.hours for s in staff_list)
 
-    # Penalty for deviation from proportional target
-    for staff in staff_list:
-        actual_notdienst = schedule.count_total_notdienst(staff.identifier, staff)
-        total_notdienst_needed = len(schedule.assignments)
+    notdienst_counts = _tally_notdienst(index, staff_list)
+    total_notdienst_needed = len(schedule.assignments)
 
+    # Penalty for deviation from proportional target; role groups are
+    # collected in the same pass for the unfairness penalty below
+    role_groups: dict[Beruf, list[float]] = defaultdict(list)
+    for staff, actual_notdienst in zip(staff_list, notdienst_counts, strict=True):
         # Target proportional to hours
         target = (staff.hours / total_hours) * total_notdienst_needed
 
         # Squared deviation penalty
-        deviation = abs(actual_notdienst - target)
-        penalty += deviation**2
+        deviation = actual_notdienst - target
+        penalty += deviation * deviation
 
-    # Penalty for unfairness within role groups
-    role_groups: dict[Beruf, list[float]] = defaultdict(list)
-    for staff in staff_list:
-        notdienst_count = schedule.count_total_notdienst(staff.identifier, staff)
-        role_groups[staff.beruf].append(notdienst_count)
+        role_groups[staff.beruf].append(actual_notdienst)
 
     # Add standard deviation penalty for each group
     for _role, counts in role_groups.items():
         if len(counts) > 1:
             mean = sum(counts) / len(counts)
-            variance = sum((x - mean) ** 2 for x in counts) / len(counts)
-            std_dev = variance**0.5
+            variance = sum((x - mean) * (x - mean) for x in counts) / len(counts)
+            std_dev = math.sqrt(variance)
             penalty += std_dev * 10  # Weight std dev heavily
     
-    # NEW: Soft penalty for nd_count violations (moved from hard constraints)
-    violations = _check_nd_count_constraint(schedule, staff_dict)
-    for v in violations:
-        # High penalty per violation to strongly discourage it, but allow it if necessary
-        penalty += 100.0
+    # NEW: Soft penalty for nd_max_consecutive violations (moved from hard constraints)
+    # Only the number of violations matters here, so no violation objects are built
+    violation_count = sum(1 for _ in _iter_nd_max_consecutive_blocks(index, staff_dict))
+    # High penalty per violation to strongly discourage it, but allow it if necessary
+    penalty += 100.0 * violation_count
 
     return penalty
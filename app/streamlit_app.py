@@ -2,15 +2,16 @@
 
 import io
 from datetime import date, timedelta
-from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 import hashlib
 import os
 from scheduler.models import (
+    NIGHT_SHIFT_TYPES,
     Beruf,
     PreviousPlanContext,
+    Schedule,
     ShiftType,
     Staff,
     Vacation,
@@ -128,6 +129,25 @@ def main() -> None:
         page_export()
 
 
+@st.cache_data(show_spinner=False)
+def _parse_staff_csv(raw: bytes) -> list[Staff]:
+    """Parse an uploaded staff CSV; reruns with the same file content hit the cache."""
+    return load_staff_from_csv(io.BytesIO(raw))
+
+
+@st.cache_data(show_spinner=False, hash_funcs={Staff: Staff.model_dump_json})
+def _staff_df(staff_list: list[Staff]) -> pd.DataFrame:
+    """One row per staff member (enums as their values), cached across reruns.
+
+    Built column by column from the attributes rather than via model_dump()
+    per staff member.
+    """
+    columns = {field: [getattr(s, field) for s in staff_list] for field in Staff.model_fields}
+    columns["beruf"] = [s.beruf.value for s in staff_list]
+    columns["abteilung"] = [s.abteilung.value for s in staff_list]
+    return pd.DataFrame(columns)
+
+
 def page_load_csv() -> None:
     """Page: Load staff data from CSV."""
     st.title("📂 Daten laden")
@@ -141,23 +161,14 @@ def page_load_csv() -> None:
 
     if uploaded_file is not None:
         try:
-            # Save to temp file and load
-            temp_path = Path("temp_staff.csv")
-            with temp_path.open("wb") as f:
-                f.write(uploaded_file.getvalue())
-
-            staff_list = load_staff_from_csv(temp_path)
+            staff_list = _parse_staff_csv(uploaded_file.getvalue())
             st.session_state.staff_list = staff_list
 
             st.success(f"✅ {len(staff_list)} Mitarbeiter erfolgreich geladen!")
 
             # Show preview
             st.markdown("### Vorschau")
-            df = pd.DataFrame([s.model_dump() for s in staff_list])
-            st.dataframe(df, width="content")
-
-            # Cleanup
-            temp_path.unlink(missing_ok=True)
+            st.dataframe(_staff_df(staff_list), width="content")
 
         except Exception as e:
             st.error(f"❌ Fehler beim Laden der CSV: {e}")
@@ -174,11 +185,7 @@ def page_load_csv() -> None:
     
     if vacation_file is not None:
         try:
-            temp_path = Path("temp_vacations.csv")
-            with temp_path.open("wb") as f:
-                f.write(vacation_file.getvalue())
-            
-            vacations = load_vacations_from_csv(temp_path)
+            vacations = load_vacations_from_csv(io.BytesIO(vacation_file.getvalue()))
             st.session_state.vacations = vacations
             
             st.success(f"✅ {len(vacations)} Urlaubseinträge erfolgreich geladen!")
@@ -188,8 +195,6 @@ def page_load_csv() -> None:
             df = pd.DataFrame([v.model_dump() for v in vacations])
             st.dataframe(df, width="content")
             
-            temp_path.unlink(missing_ok=True)
-            
         except Exception as e:
             st.error(f"❌ Fehler beim Laden der Urlaubsdaten: {e}")
 
@@ -389,43 +394,44 @@ def page_personal() -> None:
     with col3:
         nd_filter = st.selectbox("Nachtdienst", ["Alle", "ND möglich", "ND nicht möglich"])
 
-    # Apply filters
-    filtered = staff_list
+    # Apply filters as boolean masks over the cached staff table
+    df = _staff_df(staff_list)
+    mask = pd.Series(True, index=df.index)
     
     # Text search filter (name or identifier)
     if search_query:
         query_lower = search_query.lower()
-        filtered = [
-            s for s in filtered 
-            if query_lower in s.name.lower() or query_lower in s.identifier.lower()
-        ]
+        mask &= df["name"].str.lower().str.contains(query_lower, regex=False) | df[
+            "identifier"
+        ].str.lower().str.contains(query_lower, regex=False)
     
     if role_filter:
-        filtered = [s for s in filtered if s.beruf.value in role_filter]
+        mask &= df["beruf"].isin(role_filter)
     if adult_filter == "Erwachsene":
-        filtered = [s for s in filtered if s.adult]
+        mask &= df["adult"]
     elif adult_filter == "Minderjährige":
-        filtered = [s for s in filtered if not s.adult]
+        mask &= ~df["adult"]
     if nd_filter == "ND möglich":
-        filtered = [s for s in filtered if s.nd_possible]
+        mask &= df["nd_possible"]
     elif nd_filter == "ND nicht möglich":
-        filtered = [s for s in filtered if not s.nd_possible]
+        mask &= ~df["nd_possible"]
+    filtered_df = df[mask].reset_index(drop=True)
 
     # Display table
-    st.markdown(f"### Mitarbeiter ({len(filtered)} von {len(staff_list)})")
-    df = pd.DataFrame([s.model_dump() for s in filtered])
-    st.dataframe(df, width="content", height=600)
+    st.markdown(f"### Mitarbeiter ({len(filtered_df)} von {len(staff_list)})")
+    st.dataframe(filtered_df, width="content", height=600)
 
     # Statistics
     st.markdown("---")
     st.markdown("### Statistik")
+    role_counts = df["beruf"].value_counts()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("TFA", sum(1 for s in staff_list if s.beruf == Beruf.TFA))
+        st.metric("TFA", int(role_counts.get(Beruf.TFA.value, 0)))
     with col2:
-        st.metric("Azubi", sum(1 for s in staff_list if s.beruf == Beruf.AZUBI))
+        st.metric("Azubi", int(role_counts.get(Beruf.AZUBI.value, 0)))
     with col3:
-        st.metric("Intern", sum(1 for s in staff_list if s.beruf == Beruf.INTERN))
+        st.metric("Intern", int(role_counts.get(Beruf.INTERN.value, 0)))
     with col4:
         st.metric("Gesamt", len(staff_list))
 
@@ -832,6 +838,72 @@ def page_plan_erstellen() -> None:
         st.info("ℹ️ Noch kein Plan generiert")
 
 
+# Calendar column labels: one night column plus one per weekend shift type
+_NIGHT_COL = "🌙 Nacht"
+_WE_COLS = [
+    (ShiftType.SATURDAY_10_19, "☀️ Sa 10-19: Azubidienst"),
+    (ShiftType.SATURDAY_10_21, "☀️ Sa 10-21: Anmeldung/Ruf"),
+    (ShiftType.SATURDAY_10_22, "☀️ Sa 10-22: Rufbereitschaft"),
+    (ShiftType.SUNDAY_8_20, "☀️ So 08-20: Dienst"),
+    (ShiftType.SUNDAY_10_22, "☀️ So 10-22: Rufbereitschaft"),
+    (ShiftType.SUNDAY_8_2030, "☀️ So 08-20:30: Azubi/Ruf"),
+]
+
+
+@st.cache_data(show_spinner=False, hash_funcs={Schedule: Schedule.fingerprint})
+def _build_calendar_df(schedule: Schedule, id_to_name: dict[str, str] | None) -> pd.DataFrame:
+    """Compact calendar (one row per date) of the schedule, cached across reruns.
+
+    Shows full names when id_to_name is given, identifiers otherwise.
+    """
+    # Map (Date, Shift) -> [Staff1, Staff2]
+    shift_map: dict[tuple, list[str]] = {}
+    unique_dates = sorted({a.shift.shift_date for a in schedule.assignments})
+
+    for assignment in schedule.assignments:
+        key = (assignment.shift.shift_date, assignment.shift.shift_type)
+        if key not in shift_map:
+            shift_map[key] = []
+        display_value = (
+            id_to_name.get(assignment.staff_identifier, assignment.staff_identifier)
+            if id_to_name is not None
+            else assignment.staff_identifier
+        )
+        shift_map[key].append(display_value)
+
+    # Build rows: Date | 🌙 Nacht | 6× ☀️ Weekend
+    all_cols = [_NIGHT_COL] + [label for _, label in _WE_COLS]
+    calendar_rows = []
+    for d in unique_dates:
+        weekday_str = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"][d.weekday()]
+        row: dict[str, str] = {"Datum": f"{d.strftime('%d.%m.')} {weekday_str}"}
+
+        # Single night column: find the night shift for this date
+        for ns in NIGHT_SHIFT_TYPES:
+            staff_ids = shift_map.get((d, ns), [])
+            if staff_ids:
+                row[_NIGHT_COL] = " + ".join(staff_ids)
+                break
+
+        # Weekend columns
+        for s_type, col_label in _WE_COLS:
+            staff_ids = shift_map.get((d, s_type), [])
+            if staff_ids:
+                row[col_label] = " + ".join(staff_ids)
+
+        calendar_rows.append(row)
+
+    if not calendar_rows:
+        return pd.DataFrame()
+
+    df_calendar = pd.DataFrame(calendar_rows).set_index("Datum")
+    # Ensure all columns exist in correct order, fill blanks
+    for col in all_cols:
+        if col not in df_calendar.columns:
+            df_calendar[col] = ""
+    return df_calendar[all_cols].fillna("")
+
+
 def page_plan_anzeigen() -> None:
     """Page: One-stop shop for viewing, analyzing and validating the schedule."""
     st.title("📅 Dienstplan Übersicht")
@@ -862,81 +934,17 @@ def page_plan_anzeigen() -> None:
         
         # Build lookup map: identifier -> name
         id_to_name = {s.identifier: s.name for s in staff_list}
-        
-        # Night shift types (one per day)
-        NIGHT_SHIFTS = frozenset({
-            ShiftType.NIGHT_MON_TUE,
-            ShiftType.NIGHT_TUE_WED,
-            ShiftType.NIGHT_WED_THU,
-            ShiftType.NIGHT_THU_FRI,
-            ShiftType.NIGHT_FRI_SAT,
-            ShiftType.NIGHT_SAT_SUN,
-            ShiftType.NIGHT_SUN_MON,
-        })
 
-        # Column labels
-        NIGHT_COL = "🌙 Nacht"
-        WE_COLS = [
-            (ShiftType.SATURDAY_10_19, "☀️ Sa 10-19: Azubidienst"),
-            (ShiftType.SATURDAY_10_21, "☀️ Sa 10-21: Anmeldung/Ruf"),
-            (ShiftType.SATURDAY_10_22, "☀️ Sa 10-22: Rufbereitschaft"),
-            (ShiftType.SUNDAY_8_20, "☀️ So 08-20: Dienst"),
-            (ShiftType.SUNDAY_10_22, "☀️ So 10-22: Rufbereitschaft"),
-            (ShiftType.SUNDAY_8_2030, "☀️ So 08-20:30: Azubi/Ruf"),
-        ]
-
-        # Map (Date, Shift) -> [Staff1, Staff2]
-        shift_map: dict[tuple, list[str]] = {}
-        unique_dates = sorted({a.shift.shift_date for a in schedule.assignments})
-
-        for assignment in schedule.assignments:
-            key = (assignment.shift.shift_date, assignment.shift.shift_type)
-            if key not in shift_map:
-                shift_map[key] = []
-            display_value = (
-                id_to_name.get(assignment.staff_identifier, assignment.staff_identifier)
-                if show_names
-                else assignment.staff_identifier
-            )
-            shift_map[key].append(display_value)
-
-        # Build rows: Date | 🌙 Nacht | 6× ☀️ Weekend
-        all_cols = [NIGHT_COL] + [label for _, label in WE_COLS]
-        calendar_rows = []
-        for d in unique_dates:
-            weekday_str = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"][d.weekday()]
-            row: dict[str, str] = {"Datum": f"{d.strftime('%d.%m.')} {weekday_str}"}
-
-            # Single night column: find the night shift for this date
-            for ns in NIGHT_SHIFTS:
-                staff_ids = shift_map.get((d, ns), [])
-                if staff_ids:
-                    row[NIGHT_COL] = " + ".join(staff_ids)
-                    break
-
-            # Weekend columns
-            for s_type, col_label in WE_COLS:
-                staff_ids = shift_map.get((d, s_type), [])
-                if staff_ids:
-                    row[col_label] = " + ".join(staff_ids)
-
-            calendar_rows.append(row)
-
-        if calendar_rows:
-            df_calendar = pd.DataFrame(calendar_rows).set_index("Datum")
-            # Ensure all columns exist in correct order, fill blanks
-            for col in all_cols:
-                if col not in df_calendar.columns:
-                    df_calendar[col] = ""
-            df_calendar = df_calendar[all_cols].fillna("")
+        df_calendar = _build_calendar_df(schedule, id_to_name if show_names else None)
 
+        if not df_calendar.empty:
             # Style: different backgrounds for night vs weekend columns
-            we_col_names = [label for _, label in WE_COLS]
+            we_col_names = [label for _, label in _WE_COLS]
 
             def highlight_columns(df: pd.DataFrame) -> pd.DataFrame:
                 styles = pd.DataFrame("", index=df.index, columns=df.columns)
-                if NIGHT_COL in df.columns:
-                    styles[NIGHT_COL] = "background-color: #e8e0f0"
+                if _NIGHT_COL in df.columns:
+                    styles[_NIGHT_COL] = "background-color: #e8e0f0"
                 for col in we_col_names:
                     if col in df.columns:
                         styles[col] = "background-color: #fff3e0"
@@ -948,9 +956,9 @@ def page_plan_anzeigen() -> None:
 
             col_cfg: dict = {
                 "Datum": st.column_config.TextColumn("Datum", width="small"),
-                NIGHT_COL: st.column_config.TextColumn(NIGHT_COL, width="medium"),
+                _NIGHT_COL: st.column_config.TextColumn(_NIGHT_COL, width="medium"),
             }
-            for _, we_label in WE_COLS:
+            for _, we_label in _WE_COLS:
                 col_cfg[we_label] = st.column_config.TextColumn(we_label, width="medium")
 
             st.dataframe(
@@ -1,6 +1,7 @@
 """Tests for scheduler functionality."""
 
 from datetime import date
+from typing import Any
 
 import pytest
 
@@ -282,6 +283,14 @@ def test_nd_max_consecutive_constraint() -> None:
 
     # nd_max_consecutive is now a soft constraint, so check score instead of hard violations
     assert validation.soft_penalty > 0, "Should have penalty for nd_max_consecutive violation"
+
+    from app.scheduler.validator import _check_nd_max_consecutive_constraint, _ScheduleIndex
+
+    index = _ScheduleIndex(schedule.assignments, {staff.identifier: staff})
+    violations = _check_nd_max_consecutive_constraint(index, {staff.identifier: staff})
+    assert [v.description for v in violations] == [
+        "Test TFA working 3 consecutive nights starting 01.04.2026, max is 2"
+    ]
 #     
 #     # Original hard check (commented out)
 #     # nd_count_violations = [
@@ -755,6 +764,24 @@ Jul,2026-05-01,2026-05-03
         temp_path.unlink()
 
 
+def test_csv_loading_from_uploaded_bytes() -> None:
+    """Uploads are parsed straight from their bytes, without a temp file."""
+    import io
+
+    from app.scheduler.models import load_staff_from_csv, load_vacations_from_csv
+
+    staff_csv = (
+        "name,identifier,adult,hours,beruf,reception,nd_possible,nd_alone,nd_exceptions\n"
+        'Jürgen Müller,JM,true,40,TFA,true,true,false,"[3]"\n'
+    ).encode()
+    staff = load_staff_from_csv(io.BytesIO(staff_csv))
+    assert [(s.name, s.nd_exceptions) for s in staff] == [("Jürgen Müller", [3])]
+
+    vacation_csv = b"identifier,start_date,end_date\nJM,2026-04-13,2026-04-15\n"
+    vacations = load_vacations_from_csv(io.BytesIO(vacation_csv))
+    assert [(v.identifier, v.start_date) for v in vacations] == [("JM", date(2026, 4, 13))]
+
+
 def test_staff_unavailable_dates() -> None:
     """Test getting unavailable dates for a staff member."""
     from app.scheduler.models import Vacation, get_staff_unavailable_dates
@@ -1039,6 +1066,7 @@ def test_get_birthday_date_feb29_non_leap_returns_none() -> None:
 def test_birthday_blocks_shift_in_solver() -> None:
     """Birthday date is treated like a vacation day — no shifts assigned on that date."""
     from datetime import date as _date
+
     from app.scheduler.solver import generate_schedule
 
     quarter_start = _date(2026, 4, 1)
@@ -1106,5 +1134,500 @@ def test_birthday_blocks_shift_in_solver() -> None:
         )
 
 
+def test_intern_cap_unreachable_reported_without_solving() -> None:
+    """An intern with fewer than 6 available nights makes the cap unreachable."""
+    from app.scheduler.models import Vacation
+
+    quarter_start = date(2026, 4, 1)
+    intern = Staff(
+        name="Short Intern",
+        identifier="SI",
+        adult=True,
+        hours=40,
+        beruf=Beruf.INTERN,
+        reception=False,
+        nd_possible=True,
+        nd_alone=False,
+        nd_max_consecutive=3,
+        nd_min_consecutive=2,
+        nd_exceptions=[],
+    )
+    # Away for all but the last 4 days of the quarter
+    vacations = [
+        Vacation(identifier="SI", start_date=date(2026, 4, 1), end_date=date(2026, 6, 26)),
+    ]
+
+    result = generate_schedule([intern], quarter_start, vacations=vacations)
+
+    assert not result.success
+    assert any(
+        "Short Intern" in msg and "at least 6" in msg for msg in result.unsatisfiable_constraints
+    )
+
+
+def test_model_reused_for_identical_inputs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A second call with the same inputs reuses the built model; other inputs rebuild."""
+    from app.scheduler import solver_cpsat
+    from app.scheduler.models import Vacation
+
+    builds: list[tuple[Any, ...]] = []
+    build_model = solver_cpsat._build_model
+
+    def counting_build(*args: Any, **kwargs: Any) -> solver_cpsat._BuiltModel:
+        builds.append(args)
+        return build_model(*args, **kwargs)
+
+    monkeypatch.setattr(solver_cpsat, "_build_model", counting_build)
+    monkeypatch.setattr(solver_cpsat, "_MODEL_CACHE", solver_cpsat.OrderedDict())
+
+    intern = Staff(
+        name="Cached Intern",
+        identifier="CI",
+        adult=True,
+        hours=40,
+        beruf=Beruf.INTERN,
+        reception=False,
+        nd_possible=True,
+        nd_alone=False,
+        nd_max_consecutive=3,
+        nd_min_consecutive=2,
+        nd_exceptions=[],
+    )
+    vacations = [
+        Vacation(identifier="CI", start_date=date(2026, 4, 1), end_date=date(2026, 6, 26)),
+    ]
+
+    first = generate_schedule([intern], date(2026, 4, 1), vacations=vacations, random_seed=1)
+    second = generate_schedule([intern], date(2026, 4, 1), vacations=vacations, random_seed=2)
+    assert len(builds) == 1
+    assert first.unsatisfiable_constraints == second.unsatisfiable_constraints
+
+    vacations[0] = Vacation(
+        identifier="CI", start_date=date(2026, 4, 1), end_date=date(2026, 6, 25)
+    )
+    generate_schedule([intern], date(2026, 4, 1), vacations=vacations)
+    assert len(builds) == 2
+
+
+def test_cached_model_solves_after_clone(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A cache hit on a solvable model remaps the cloned variables and yields the same schedule."""
+    from app.scheduler import solver_cpsat
+    from app.scheduler.models import Vacation
+
+    builds: list[tuple[Any, ...]] = []
+    build_model = solver_cpsat._build_model
+
+    def counting_build(*args: Any, **kwargs: Any) -> solver_cpsat._BuiltModel:
+        builds.append(args)
+        return build_model(*args, **kwargs)
+
+    monkeypatch.setattr(solver_cpsat, "_build_model", counting_build)
+    monkeypatch.setattr(solver_cpsat, "_MODEL_CACHE", solver_cpsat.OrderedDict())
+
+    staff = [
+        Staff(
+            name=f"Solo {identifier}",
+            identifier=identifier,
+            adult=True,
+            hours=40,
+            beruf=Beruf.TFA,
+            reception=True,
+            nd_possible=True,
+            nd_alone=True,
+            nd_max_consecutive=3,
+            nd_min_consecutive=1,
+            nd_exceptions=[],
+        )
+        for identifier in ("S1", "S2")
+    ]
+    # S1 is free for Wed/Thu 15.-16.04, S2 for Wed/Thu 22.-23.04
+    vacations = [
+        Vacation(identifier="S1", start_date=date(2026, 4, 1), end_date=date(2026, 4, 14)),
+        Vacation(identifier="S1", start_date=date(2026, 4, 17), end_date=date(2026, 6, 30)),
+        Vacation(identifier="S2", start_date=date(2026, 4, 1), end_date=date(2026, 4, 21)),
+        Vacation(identifier="S2", start_date=date(2026, 4, 24), end_date=date(2026, 6, 30)),
+    ]
+
+    def solve(seed: int) -> list[tuple[str, date]]:
+        result = generate_schedule(staff, date(2026, 4, 1), vacations=vacations, random_seed=seed)
+        assert result.success
+        schedule = result.get_best_schedule()
+        assert validate_schedule(schedule, staff).is_valid()
+        return sorted((a.staff_identifier, a.shift.shift_date) for a in schedule.assignments)
+
+    first = solve(1)
+    second = solve(2)
+
+    assert len(builds) == 1
+    assert first == second == [
+        ("S1", date(2026, 4, 15)),
+        ("S1", date(2026, 4, 16)),
+        ("S2", date(2026, 4, 22)),
+        ("S2", date(2026, 4, 23)),
+    ]
+
+
+def test_min_block_constraint_requires_full_block() -> None:
+    """With nd_min_consecutive=3, assigned nights must lie in a 3-night block within a run."""
+    from datetime import timedelta
+
+    from ortools.sat.python import cp_model
+
+    from app.scheduler.solver_cpsat import _add_min_block_constraint
+
+    # Run of 4 consecutive nights, a gap, then a run of 2
+    start = date(2026, 4, 1)
+    dates = [start + timedelta(days=i) for i in (0, 1, 2, 3, 5, 6)]
+
+    def feasible(assigned: set[int]) -> bool:
+        model = cp_model.CpModel()
+        night_vars = [model.NewBoolVar(f"n{i}") for i in range(len(dates))]
+        _add_min_block_constraint(model, list(zip(dates, night_vars, strict=True)), 3)
+        for i, var in enumerate(night_vars):
+            model.Add(var == (1 if i in assigned else 0))
+        status = cp_model.CpSolver().Solve(model)
+        return status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+    assert feasible(set())
+    assert feasible({0, 1, 2})
+    assert feasible({0, 1, 2, 3})
+    assert not feasible({0, 1})
+    assert not feasible({4, 5})  # Run too short for any block
+
+
+def test_pruned_night_slots_still_count_for_coverage() -> None:
+    """A night whose only non-Azubi was pruned (run too short) cannot go to an Azubi alone."""
+    from app.scheduler.models import Vacation
+
+    tfa = Staff(
+        name="Short Run TFA",
+        identifier="T",
+        adult=True,
+        hours=40,
+        beruf=Beruf.TFA,
+        reception=True,
+        nd_possible=True,
+        nd_alone=False,
+        nd_max_consecutive=3,
+        nd_min_consecutive=2,
+        nd_exceptions=[],
+    )
+    azubi = Staff(
+        name="Azubi",
+        identifier="A",
+        adult=True,
+        hours=40,
+        beruf=Beruf.AZUBI,
+        reception=True,
+        nd_possible=True,
+        nd_alone=False,
+        nd_max_consecutive=2,
+        nd_min_consecutive=1,
+        nd_exceptions=[],
+    )
+    # The TFA is free only on 15.04 and 17.04 (two one-night runs), the Azubi only on 15.04
+    vacations = [
+        Vacation(identifier="T", start_date=date(2026, 4, 1), end_date=date(2026, 4, 14)),
+        Vacation(identifier="T", start_date=date(2026, 4, 16), end_date=date(2026, 4, 16)),
+        Vacation(identifier="T", start_date=date(2026, 4, 18), end_date=date(2026, 6, 30)),
+        Vacation(identifier="A", start_date=date(2026, 4, 1), end_date=date(2026, 4, 14)),
+        Vacation(identifier="A", start_date=date(2026, 4, 16), end_date=date(2026, 6, 30)),
+    ]
+
+    result = generate_schedule(
+        [tfa, azubi], date(2026, 4, 1), vacations=vacations, max_solve_time_seconds=10
+    )
+
+    assert not result.success
+
+
+def test_validate_schedule_cached_reuses_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reordered assignments hit the cache; changed assignments or staff do not."""
+    from app.scheduler import validator
+    from app.scheduler.models import Assignment, Schedule, Shift
+    from app.scheduler.validator import ValidationResult
+
+    monkeypatch.setattr(validator, "_VALIDATION_CACHE", validator.OrderedDict())
+    runs: list[Schedule] = []
+    validate = validator.validate_schedule
+
+    def counting_validate(schedule: Schedule, staff_list: list[Staff]) -> ValidationResult:
+        runs.append(schedule)
+        return validate(schedule, staff_list)
+
+    monkeypatch.setattr(validator, "validate_schedule", counting_validate)
+
+    staff = Staff(
+        name="Cached TFA",
+        identifier="CT",
+        adult=True,
+        hours=40,
+        beruf=Beruf.TFA,
+        reception=True,
+        nd_possible=True,
+        nd_alone=True,
+        nd_exceptions=[],
+    )
+    night = Assignment(
+        shift=Shift(shift_type=ShiftType.NIGHT_TUE_WED, shift_date=date(2026, 4, 7)),
+        staff_identifier="CT",
+    )
+    weekend = Assignment(
+        shift=Shift(shift_type=ShiftType.SATURDAY_10_21, shift_date=date(2026, 4, 11)),
+        staff_identifier="CT",
+    )
+
+    def make(assignments: list[Assignment]) -> Schedule:
+        return Schedule(
+            quarter_start=date(2026, 4, 1), quarter_end=date(2026, 6, 30), assignments=assignments
+        )
+
+    first = validator.validate_schedule_cached(make([night, weekend]), [staff])
+    reordered = validator.validate_schedule_cached(make([weekend, night]), [staff])
+    assert len(runs) == 1
+    assert reordered.hard_violations == first.hard_violations
+
+    # Callers get their own list, so mutating it leaves the cached result intact
+    reordered.hard_violations.clear()
+    again = validator.validate_schedule_cached(make([night, weekend]), [staff])
+    assert again.hard_violations == first.hard_violations
+    assert len(runs) == 1
+
+    validator.validate_schedule_cached(make([weekend]), [staff])
+    assert len(runs) == 2
+
+    restricted = staff.model_copy(update={"nd_exceptions": [2]})
+    changed = validator.validate_schedule_cached(make([night, weekend]), [restricted])
+    assert len(runs) == 3
+    assert any(v.constraint_name == "ND Exception Weekday" for v in changed.hard_violations)
+    assert not any(v.constraint_name == "ND Exception Weekday" for v in first.hard_violations)
+
+
+def test_validate_swap_matches_full_validation() -> None:
+    """Swapping a minor off a Sunday shift drops only that per-assignment violation."""
+    from app.scheduler.models import Assignment, Schedule, Shift
+    from app.scheduler.validator import validate_swap
+
+    def tfa(identifier: str, adult: bool) -> Staff:
+        return Staff(
+            name=identifier,
+            identifier=identifier,
+            adult=adult,
+            hours=40,
+            beruf=Beruf.TFA,
+            reception=True,
+            nd_possible=True,
+            nd_alone=True,
+            nd_exceptions=[],
+        )
+
+    staff = [tfa("MINOR", adult=False), tfa("ADULT", adult=True)]
+    sundays = [date(2026, 4, 5), date(2026, 4, 26)]
+    before = [
+        Assignment(
+            shift=Shift(shift_type=ShiftType.SUNDAY_8_20, shift_date=day), staff_identifier="MINOR"
+        )
+        for day in sundays
+    ]
+    after = [
+        before[0],
+        Assignment(shift=before[1].shift, staff_identifier="ADULT"),
+    ]
+
+    def make(assignments: list[Assignment]) -> Schedule:
+        return Schedule(
+            quarter_start=date(2026, 4, 1), quarter_end=date(2026, 6, 30), assignments=assignments
+        )
+
+    previous = validate_schedule(make(before), staff)
+    assert [v.constraint_name for v in previous.hard_violations].count("Minor Sunday Ban") == 2
+
+    swapped = validate_swap(previous, make(after), staff, [before[1], after[1]])
+    full = validate_schedule(make(after), staff)
+    assert sorted(map(str, swapped.hard_violations)) == sorted(map(str, full.hard_violations))
+    assert swapped.soft_penalty == full.soft_penalty
+    assert [v.constraint_name for v in swapped.hard_violations].count("Minor Sunday Ban") == 1
+
+
+def test_validate_schedule_early_exit() -> None:
+    """max_hard_violations stops after that many violations; hard_only skips the penalty
+    of invalid schedules."""
+    from app.scheduler import validator
+    from app.scheduler.models import Assignment, Schedule, Shift
+
+    assert set(validator._HARD_CHECKS_CHEAPEST_FIRST) == set(validator._HARD_CHECKS)
+
+    intern = Staff(
+        name="Weekend Intern",
+        identifier="WI",
+        adult=True,
+        hours=40,
+        beruf=Beruf.INTERN,
+        reception=False,
+        nd_possible=True,
+        nd_alone=True,
+        nd_exceptions=[],
+    )
+    schedule = Schedule(
+        quarter_start=date(2026, 4, 1),
+        quarter_end=date(2026, 6, 30),
+        assignments=[
+            Assignment(
+                shift=Shift(shift_type=ShiftType.SATURDAY_10_22, shift_date=day),
+                staff_identifier="WI",
+            )
+            for day in (date(2026, 4, 4), date(2026, 4, 11), date(2026, 4, 12))
+        ],
+    )
+
+    full = validate_schedule(schedule, [intern])
+    assert len(full.hard_violations) > 1
+
+    early = validate_schedule(schedule, [intern], max_hard_violations=1, hard_only=True)
+    assert len(early.hard_violations) == 1
+    assert not early.is_valid()
+    assert early.soft_penalty == 0.0
+
+    # A limit of 0 would truncate every violation and report the schedule as valid
+    with pytest.raises(ValueError, match="max_hard_violations"):
+        validate_schedule(schedule, [intern], max_hard_violations=0)
+
+    valid = Schedule(
+        quarter_start=schedule.quarter_start,
+        quarter_end=schedule.quarter_end,
+        assignments=schedule.assignments[:1],
+    )
+    tfa = intern.model_copy(update={"beruf": Beruf.TFA, "reception": True})
+    idle = tfa.model_copy(update={"identifier": "IDLE"})
+    ranked = validate_schedule(valid, [tfa, idle], max_hard_violations=1, hard_only=True)
+    assert ranked.is_valid()
+    assert ranked.soft_penalty == validate_schedule(valid, [tfa, idle]).soft_penalty > 0
+
+
+def test_tally_notdienst_matches_schedule_counts() -> None:
+    """The single-pass tally agrees with Schedule.count_total_notdienst per staff member."""
+    from app.scheduler.models import Assignment, Schedule, Shift
+    from app.scheduler.validator import _ScheduleIndex, _tally_notdienst
+
+    def member(identifier: str, beruf: Beruf) -> Staff:
+        return Staff(
+            name=identifier,
+            identifier=identifier,
+            adult=True,
+            hours=40,
+            beruf=beruf,
+            reception=True,
+            nd_possible=True,
+            nd_alone=False,
+            nd_exceptions=[],
+        )
+
+    staff = [member("TFA", Beruf.TFA), member("AZ", Beruf.AZUBI), member("IDLE", Beruf.TFA)]
+    night = Shift(shift_type=ShiftType.NIGHT_SUN_MON, shift_date=date(2026, 4, 5))
+    schedule = Schedule(
+        quarter_start=date(2026, 4, 1),
+        quarter_end=date(2026, 6, 30),
+        assignments=[
+            Assignment(shift=night, staff_identifier="TFA", is_paired=True),
+            Assignment(shift=night, staff_identifier="AZ", is_paired=True),
+            Assignment(
+                shift=Shift(shift_type=ShiftType.SATURDAY_10_21, shift_date=date(2026, 4, 11)),
+                staff_identifier="TFA",
+            ),
+        ],
+    )
+
+    index = _ScheduleIndex(schedule.assignments, {s.identifier: s for s in staff})
+    assert _tally_notdienst(index, staff) == [
+        schedule.count_total_notdienst(s.identifier, s) for s in staff
+    ]
+    assert _tally_notdienst(index, staff) == [1.5, 1.0, 0]
+
+
+def test_eligibility_table_follows_staff_changes() -> None:
+    """Cached eligibility is keyed by the staff fields, so edited staff are re-evaluated."""
+    from app.scheduler.models import Assignment, Schedule, Shift
+
+    tfa = Staff(
+        name="Night TFA",
+        identifier="NT",
+        adult=True,
+        hours=40,
+        beruf=Beruf.TFA,
+        reception=True,
+        nd_possible=True,
+        nd_alone=True,
+        nd_exceptions=[],
+    )
+    schedule = Schedule(
+        quarter_start=date(2026, 4, 1),
+        quarter_end=date(2026, 6, 30),
+        assignments=[
+            Assignment(
+                shift=Shift(shift_type=ShiftType.NIGHT_WED_THU, shift_date=date(2026, 4, 8)),
+                staff_identifier="NT",
+            )
+        ],
+    )
+
+    def eligibility_violations(staff: Staff) -> int:
+        result = validate_schedule(schedule, [staff])
+        return [v.constraint_name for v in result.hard_violations].count("Shift Eligibility")
+
+    assert eligibility_violations(tfa) == 0
+    assert eligibility_violations(tfa.model_copy(update={"nd_exceptions": [3]})) == 1
+    assert eligibility_violations(tfa.model_copy(update={"nd_possible": False})) == 1
+    assert eligibility_violations(tfa) == 0
+
+
+def test_schedule_fingerprint_tracks_contents() -> None:
+    """Equal schedules share a fingerprint; any assignment change alters it."""
+    from app.scheduler.models import Assignment, Schedule, Shift
+
+    night = Shift(shift_type=ShiftType.NIGHT_SUN_MON, shift_date=date(2026, 4, 5))
+
+    def make(is_paired: bool) -> Schedule:
+        return Schedule(
+            quarter_start=date(2026, 4, 1),
+            quarter_end=date(2026, 6, 30),
+            assignments=[Assignment(shift=night, staff_identifier="AA", is_paired=is_paired)],
+        )
+
+    assert make(False).fingerprint() == make(False).fingerprint()
+    assert make(False).fingerprint() != make(True).fingerprint()
+    hash(make(False).fingerprint())
+
+
+def test_infeasibility_core_names_only_conflicting_group() -> None:
+    """With an objective set, the core still names just the guarded group in conflict."""
+    from ortools.sat.python import cp_model
+
+    from app.scheduler.solver_cpsat import _conflicting_assumptions
+
+    model = cp_model.CpModel()
+    nights = model.NewIntVar(0, 10, "nights")
+    weekends = model.NewIntVar(0, 10, "weekends")
+    cap, weekend_min, weekend_max = (model.NewBoolVar(name) for name in ("cap", "min", "max"))
+    model.Add(nights <= 3)
+    model.Add(nights >= 5).OnlyEnforceIf(cap)
+    model.Add(weekends >= 1).OnlyEnforceIf(weekend_min)
+    model.Add(weekends <= 8).OnlyEnforceIf(weekend_max)
+    model.Minimize(nights + weekends)
+    assumptions = {
+        "Intern night cap": cap,
+        "Minimum weekend": weekend_min,
+        "Weekend cap": weekend_max,
+    }
+    model.AddAssumptions(list(assumptions.values()))
+
+    solver = cp_model.CpSolver()
+    assert solver.Solve(model) == cp_model.INFEASIBLE
+
+    conflicts = _conflicting_assumptions(
+        model, {name: lit.Index() for name, lit in assumptions.items()}, 10
+    )
+    assert conflicts == ["Conflicting constraint: Intern night cap"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])